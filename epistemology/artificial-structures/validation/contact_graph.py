@@ -14,10 +14,13 @@ No randomness here; randomized sweeps live in the runner.
 
 from __future__ import annotations
 
+import heapq
 import itertools
 from dataclasses import dataclass, field
 from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
+import numpy as np
+
 Vertex = int
 Edge = Tuple[Vertex, Vertex]  # always stored as (min, max)
 
@@ -40,6 +43,37 @@ class ContactGraph:
     weight: Dict[Edge, float]
     floor: float
     medium: Vertex
+    # derived indices, built lazily and dropped whenever the graph changes
+    _adj: Optional[Dict[Vertex, List[Vertex]]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _arrays: Optional["_EdgeArrays"] = field(
+        default=None, init=False, repr=False, compare=False)
+    # residual network for separation_from_medium, built on first query
+    _flow: Optional["_FlowNetwork"] = field(default=None, init=False,
+                                            repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in ("vertices", "weight", "medium"):
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop the cached adjacency, edge arrays and flows.
+
+        Reassigning vertices/weight/medium or calling set_weight does this
+        automatically; call it after mutating `weight` in place by hand.
+        """
+        object.__setattr__(self, "_adj", None)
+        object.__setattr__(self, "_arrays", None)
+        object.__setattr__(self, "_flow", None)
+
+    def set_weight(self, u: Vertex, v: Vertex, wv: float) -> None:
+        """Set edge (u, v) to weight wv in place (wv == 0 removes it)."""
+        if wv:
+            self.weight[_e(u, v)] = wv
+        else:
+            self.weight.pop(_e(u, v), None)
+        self.invalidate()
 
     # --- basic accessors ---
     @property
@@ -49,17 +83,21 @@ class ContactGraph:
     def w(self, u: Vertex, v: Vertex) -> float:
         return self.weight.get(_e(u, v), 0.0)
 
+    def _adjacency(self) -> Dict[Vertex, List[Vertex]]:
+        # neighbour lists keep weight-dict order (the random walks rely on it)
+        if self._adj is None:
+            adj: Dict[Vertex, List[Vertex]] = {v: [] for v in self.vertices}
+            for (a, b) in self.weight:
+                adj.setdefault(a, []).append(b)
+                adj.setdefault(b, []).append(a)
+            object.__setattr__(self, "_adj", adj)
+        return self._adj
+
     def neighbours(self, v: Vertex) -> List[Vertex]:
-        out = []
-        for (a, b) in self.weight:
-            if a == v:
-                out.append(b)
-            elif b == v:
-                out.append(a)
-        return out
+        return list(self._adjacency().get(v, ()))
 
     def degree(self, v: Vertex) -> int:
-        return len(self.neighbours(v))
+        return len(self._adjacency().get(v, ()))
 
     @property
     def min_edge_weight(self) -> float:
@@ -69,38 +107,105 @@ class ContactGraph:
     def is_connected(self) -> bool:
         if not self.vertices:
             return True
+        adj = self._adjacency()
         start = next(iter(self.vertices))
         seen = {start}
         stack = [start]
         while stack:
             x = stack.pop()
-            for y in self.neighbours(x):
+            for y in adj[x]:
                 if y not in seen:
                     seen.add(y)
                     stack.append(y)
         return seen == set(self.vertices)
 
+    # --- NumPy edge arrays (masks are indexed by vertex_order) ---
+    def _edge_arrays(self) -> "_EdgeArrays":
+        if self._arrays is None:
+            object.__setattr__(self, "_arrays",
+                               _EdgeArrays(self.vertices, self.weight))
+        return self._arrays
+
+    @property
+    def vertex_order(self) -> List[Vertex]:
+        """Vertex for each position of a membership mask (sorted)."""
+        return self._edge_arrays().order
+
+    def membership_mask(self, S: Iterable[Vertex]) -> np.ndarray:
+        """Boolean mask over vertex_order with True exactly on S."""
+        arr = self._edge_arrays()
+        m = np.zeros(len(arr.order), dtype=bool)
+        m[[arr.index[v] for v in S]] = True
+        return m
+
     # --- cuts ---
     def cut_edges(self, S: FrozenSet[Vertex]) -> List[Edge]:
         """Edges with exactly one endpoint in S."""
-        out = []
-        for (a, b) in self.weight:
-            if (a in S) != (b in S):
-                out.append((a, b))
-        return out
+        return [e for e in self.weight if (e[0] in S) != (e[1] in S)]
 
-    def cut_weight(self, S: FrozenSet[Vertex]) -> float:
-        return sum(self.weight[e] for e in self.cut_edges(S))
+    def cut_weight(self, S):
+        """Weight of the cut around S.
+
+        S is a vertex set, or a boolean membership mask over vertex_order
+        (1-D -> float, 2-D rows = subsets -> array), reduced in one pass over
+        the edge arrays.
+        """
+        if isinstance(S, np.ndarray):
+            arr = self._edge_arrays()
+            M = np.asarray(S, dtype=bool)
+            return (M[..., arr.u] != M[..., arr.v]) @ arr.w
+        return sum(wv for (a, b), wv in self.weight.items()
+                   if (a in S) != (b in S))
 
     def boundary_cost(self, U: FrozenSet[Vertex]) -> float:
         """b(U) = weight of the cut separating U from the rest."""
         return self.cut_weight(U)
 
+    # --- batched cuts over a family of subsets ---
+    def subset_matrix(self, subsets: Iterable[Iterable[Vertex]]) -> np.ndarray:
+        """2-D boolean matrix, one row per subset, columns in vertex_order."""
+        index = self._edge_arrays().index
+        subsets = list(subsets)
+        M = np.zeros((len(subsets), len(index)), dtype=bool)
+        for r, S in enumerate(subsets):
+            M[r, [index[v] for v in S]] = True
+        return M
+
+    def cut_weights(self, subsets) -> np.ndarray:
+        """Cut weight of every subset in one reduction.
+
+        subsets is a 2-D boolean matrix (rows = subsets, as from
+        subset_matrix) or a sequence of vertex sets.
+        """
+        M = subsets if isinstance(subsets, np.ndarray) else self.subset_matrix(subsets)
+        return self.cut_weight(M.reshape(-1, len(self.vertex_order)))
+
+    def boundary_costs(self, subsets) -> np.ndarray:
+        """b(U) for every U in subsets (see cut_weights)."""
+        return self.cut_weights(subsets)
+
     # --- separation cost from the medium (min cut with U on one side, medium on other) ---
-    def separation_from_medium(self, v: Vertex) -> float:
+    def separation_from_medium(self, v: Vertex, brute_force: bool = False
+                               ) -> Tuple[float, FrozenSet[Vertex]]:
         """sigma(v): min over S with v in S, medium not in S, of cut_weight(S).
-        Brute force over subsets containing v and excluding medium (small graphs).
+
+        An s-t minimum cut (Dinic max flow, v -> medium) on a residual network
+        cached on the graph: later queries for other parts reuse it, and a
+        graph derived by `with_edge` inherits the flows already pushed. S is
+        the inclusion-minimal minimiser (what the subset enumeration finds
+        first) and sigma is re-summed via cut_weight(S).
+        brute_force=True enumerates subsets instead (oracle, small graphs).
         """
+        if v == self.medium:
+            raise ValueError("separation_from_medium needs a part, not the medium")
+        if brute_force:
+            return self._separation_brute_force(v)
+        if self._flow is None:
+            self._flow = _FlowNetwork(self.vertices, self.weight, self.medium)
+        S = self._flow.min_cut_side(v)
+        return self.cut_weight(S), S
+
+    def _separation_brute_force(self, v: Vertex) -> Tuple[float, FrozenSet[Vertex]]:
         others = [x for x in self.vertices if x not in (v, self.medium)]
         best = float("inf")
         best_S = None
@@ -114,9 +219,45 @@ class ContactGraph:
                     best_S = S
         return best, best_S
 
+    def with_edge(self, u: Vertex, v: Vertex, wv: float) -> "ContactGraph":
+        """A copy of this graph with edge (u, v) set to weight wv.
+
+        If the edge only gains weight, every cached flow stays feasible and
+        is carried over, so separation queries on the copy just augment it.
+        """
+        e = _e(u, v)
+        neww = dict(self.weight)
+        old = neww.get(e, 0.0)
+        neww[e] = wv
+        G = ContactGraph(self.vertices, neww, self.floor, self.medium)
+        if self._flow is not None and wv >= old:
+            G._flow = self._flow.raised(u, v, wv - old)
+        return G
+
     # --- residual: min cut weight over all nontrivial bipartitions ---
-    def residual(self) -> Tuple[float, FrozenSet[Vertex]]:
-        """rho(G) = min over nonempty proper S of cut_weight(S) (global min cut)."""
+    def residual(self, brute_force: bool = False) -> Tuple[float, FrozenSet[Vertex]]:
+        """rho(G) = min over nonempty proper S of cut_weight(S) (global min cut).
+
+        Computed exactly by Stoer-Wagner in O(V E log V); rho is re-summed
+        over the original edges so it is bit-identical to cut_weight(S).
+        S is one minimising side, normalised to contain the smallest vertex.
+        It is deterministic for a given graph, but when several cuts attain
+        rho it is an arbitrary one of them and need not be the side the subset
+        enumeration returns -- only rho is guaranteed to agree.
+        brute_force=True runs the 2^(n-1) subset enumeration instead (kept as
+        an oracle for small graphs).
+        """
+        if brute_force:
+            return self._residual_brute_force()
+        verts = sorted(self.vertices)
+        if len(verts) < 2:
+            return float("inf"), None
+        S = _stoer_wagner(verts, self.weight)
+        if verts[0] not in S:
+            S = frozenset(self.vertices - S)
+        return self.cut_weight(S), S
+
+    def _residual_brute_force(self) -> Tuple[float, FrozenSet[Vertex]]:
         verts = sorted(self.vertices)
         n = len(verts)
         best = float("inf")
@@ -131,8 +272,8 @@ class ContactGraph:
                 if cw < best:
                     best = cw
                     best_S = S
-        # also singletons not containing verts[0]
-        for v in verts[1:]:
+        # also singletons (the r-loop never reaches {verts[0]} on its own)
+        for v in verts:
             S = frozenset((v,))
             cw = self.cut_weight(S)
             if cw < best:
@@ -141,6 +282,156 @@ class ContactGraph:
         return best, best_S
 
 
+def _stoer_wagner(verts: List[Vertex],
+                  weight: Dict[Edge, float]) -> FrozenSet[Vertex]:
+    """One side of a global minimum cut (Stoer-Wagner, heap-ordered phases).
+
+    Each phase grows a maximum-adjacency ordering; the last-added super-vertex
+    against the rest is a candidate cut, and the last two are then merged.
+    A disconnected graph yields a zero-weight side.
+    """
+    adj: Dict[Vertex, Dict[Vertex, float]] = {v: {} for v in verts}
+    for (a, b), wv in weight.items():
+        adj[a][b] = adj[a].get(b, 0.0) + wv
+        adj[b][a] = adj[b].get(a, 0.0) + wv
+    members: Dict[Vertex, List[Vertex]] = {v: [v] for v in verts}
+    best = float("inf")
+    best_S: FrozenSet[Vertex] = frozenset()
+    while len(adj) > 1:
+        key = {v: 0.0 for v in adj}
+        heap = [(0.0, v) for v in adj]
+        heapq.heapify(heap)
+        added: Set[Vertex] = set()
+        prev = last = None
+        while heap:
+            negk, u = heapq.heappop(heap)
+            if u in added or -negk != key[u]:
+                continue  # stale heap entry
+            added.add(u)
+            prev, last = last, u
+            for x, wv in adj[u].items():
+                if x not in added:
+                    key[x] += wv
+                    heapq.heappush(heap, (-key[x], x))
+        if key[last] < best:
+            best = key[last]
+            best_S = frozenset(members[last])
+        # merge `last` into `prev`
+        members[prev].extend(members.pop(last))
+        for x, wv in adj.pop(last).items():
+            del adj[x][last]
+            if x != prev:
+                adj[prev][x] = adj[prev].get(x, 0.0) + wv
+                adj[x][prev] = adj[x].get(prev, 0.0) + wv
+    return best_S
+
+
+class _EdgeArrays:
+    """Edge list of a ContactGraph as parallel NumPy arrays.
+
+    order/index map vertices to mask positions; u, v are endpoint positions
+    and w the weights, all in weight-dict order.
+    """
+
+    def __init__(self, vertices: Iterable[Vertex], weight: Dict[Edge, float]):
+        self.order: List[Vertex] = sorted(vertices)
+        self.index: Dict[Vertex, int] = {x: i for i, x in enumerate(self.order)}
+        m = len(weight)
+        self.u = np.fromiter((self.index[a] for a, _ in weight), np.intp, m)
+        self.v = np.fromiter((self.index[b] for _, b in weight), np.intp, m)
+        self.w = np.fromiter(weight.values(), np.float64, m)
+
+
+class _FlowNetwork:
+    """Undirected capacity network with the medium as sink.
+
+    Holds one max flow per source vertex already queried (flows are
+    antisymmetric dicts, f[u][x] == -f[x][u]), so a repeated query is a
+    residual-graph search and a raised capacity resumes from the old flow.
+    """
+
+    def __init__(self, vertices: Iterable[Vertex], weight: Dict[Edge, float],
+                 sink: Vertex):
+        self.sink = sink
+        self.cap: Dict[Vertex, Dict[Vertex, float]] = {v: {} for v in vertices}
+        for (a, b), wv in weight.items():
+            self.cap[a][b] = self.cap[a].get(b, 0.0) + wv
+            self.cap[b][a] = self.cap[b].get(a, 0.0) + wv
+        self.eps = 1e-12 * max(1.0, sum(weight.values()))
+        self.flows: Dict[Vertex, Dict[Vertex, Dict[Vertex, float]]] = {}
+
+    def raised(self, u: Vertex, v: Vertex, dw: float) -> "_FlowNetwork":
+        """A copy with capacity(u, v) increased by dw >= 0, flows kept."""
+        net = _FlowNetwork.__new__(_FlowNetwork)
+        net.sink = self.sink
+        net.cap = {x: dict(nb) for x, nb in self.cap.items()}
+        net.cap[u][v] = net.cap[u].get(v, 0.0) + dw
+        net.cap[v][u] = net.cap[v].get(u, 0.0) + dw
+        net.eps = self.eps + 1e-12 * dw
+        net.flows = {s: {x: dict(fx) for x, fx in f.items()}
+                     for s, f in self.flows.items()}
+        return net
+
+    def _residual(self, f: Dict[Vertex, Dict[Vertex, float]],
+                  u: Vertex, x: Vertex) -> float:
+        return self.cap[u][x] - f[u].get(x, 0.0)
+
+    def _levels(self, s: Vertex, f) -> Dict[Vertex, int]:
+        level = {s: 0}
+        queue = [s]
+        for u in queue:
+            for x in self.cap[u]:
+                if x not in level and self._residual(f, u, x) > self.eps:
+                    level[x] = level[u] + 1
+                    queue.append(x)
+        return level
+
+    def _augment(self, s: Vertex, f) -> None:
+        """Dinic: BFS level graph, then blocking flows by iterative DFS."""
+        t = self.sink
+        while True:
+            level = self._levels(s, f)
+            if t not in level:
+                return
+            arcs = {u: list(self.cap[u]) for u in level}
+            ptr = dict.fromkeys(level, 0)
+            path = [s]
+            while path:
+                u = path[-1]
+                if u == t:
+                    push = min(self._residual(f, a, b)
+                               for a, b in zip(path, path[1:]))
+                    for a, b in zip(path, path[1:]):
+                        f[a][b] = f[a].get(b, 0.0) + push
+                        f[b][a] = f[b].get(a, 0.0) - push
+                    path = [s]
+                    continue
+                nbrs = arcs[u]
+                i = ptr[u]
+                while i < len(nbrs):
+                    x = nbrs[i]
+                    if (level.get(x) == level[u] + 1
+                            and self._residual(f, u, x) > self.eps):
+                        break
+                    i += 1
+                ptr[u] = i
+                if i < len(nbrs):
+                    path.append(nbrs[i])
+                else:
+                    level[u] = -1  # dead end for this phase
+                    path.pop()
+                    if path:
+                        ptr[path[-1]] += 1
+
+    def min_cut_side(self, s: Vertex) -> FrozenSet[Vertex]:
+        """Source side of the inclusion-minimal minimum s-sink cut."""
+        f = self.flows.get(s)
+        if f is None:
+            f = self.flows[s] = {x: {} for x in self.cap}
+        self._augment(s, f)
+        return frozenset(self._levels(s, f))
+
+
 # ---------------------------------------------------------------------
 #  Builders
 # ---------------------------------------------------------------------
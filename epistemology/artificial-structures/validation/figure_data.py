@@ -61,7 +61,7 @@ def panel1():
     floor_v, bcost, ratio = [], [], []
     nc, fl, minb = [], [], []
     for G, floor in sweep(rng, 250):
-        bs = [G.boundary_cost(U) for U in proper_parts(G)]
+        bs = G.boundary_costs(proper_parts(G)).tolist()
         for b in bs:
             floor_v.append(floor); bcost.append(b); ratio.append(b / floor)
         nc.append(len(G.vertices)); fl.append(floor); minb.append(min(bs))
@@ -83,7 +83,7 @@ def panel2():
     fl, mincut = [], []
     nc, fl2, mc2 = [], [], []
     for G, floor in sweep(rng, 250):
-        cs = [G.cut_weight(U) for U in proper_parts(G)]
+        cs = G.cut_weights(proper_parts(G)).tolist()
         for c in cs:
             floor_v.append(floor); cutw.append(c)
         fl.append(floor); mincut.append(min(cs))
@@ -348,13 +348,12 @@ def panel10():
     # resolution: add boundary edges one at a time -> separation non-decreasing, never 0
     addk, sep_res = [], []
     base = cg.make_medium_graph(random.Random(9), 7, 1.0, 0.3, 4.0)
-    neww = dict(base.weight)
     far_targets = [v for v in base.vertices if v not in (part, base.medium)]
     s0, _ = base.separation_from_medium(part)
     addk.append(0); sep_res.append(s0)
+    Gp = base
     for kk, t in enumerate(far_targets, start=1):
-        neww[cg._e(part, t)] = base.floor * 2
-        Gp = ContactGraph(base.vertices, neww, base.floor, base.medium)
+        Gp = Gp.with_edge(part, t, base.floor * 2)
         s, _ = Gp.separation_from_medium(part)
         addk.append(kk); sep_res.append(s)
     # 3D: residual surface over (measurement index, three seeds)
@@ -7,7 +7,23 @@ density, weight spread) and runs every theorem-validator on each, plus the
 standalone witnesses. Aggregates pass/fail and writes a JSON report.
 
 Usage:
-    python run_validation.py [--seed N] [--graphs K] [--out results.json]
+    python run_validation.py [--seed N] [--graphs K] [--workers W]
+                             [--out results.json] [--stream]
+                             [--checkpoint ckpt.json] [--checkpoint-every C]
+
+With --stream the report is JSON Lines: one compact {"record": "graph"}
+line per graph, flushed as it completes, then a final {"record": "summary"}
+line holding everything else. Only running aggregates stay in memory.
+
+Graph k is drawn from its own RNG seeded by (seed, k), so the report is the
+same for any --workers count.
+
+With --checkpoint PATH the completed-graph count and running aggregates are
+saved every --checkpoint-every graphs; rerunning with the same seed, --graphs,
+--out and --stream resumes after the last saved graph and produces the same
+report as an uninterrupted run. Without --stream the finished graph reports
+are appended to PATH.graphs.jsonl as they complete and the checkpoint records
+only its length. Both files are removed on completion.
 
 Exit code 0 iff every check on every graph passed.
 """
@@ -15,17 +31,24 @@ Exit code 0 iff every check on every graph passed.
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import platform
 import random
 import sys
 import time
 from collections import defaultdict
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, Optional
 
 import contact_graph as cg
 from validators import ALL_VALIDATORS, STANDALONE_VALIDATORS
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "common"))
+from sweep_io import (ReportSink, clear_checkpoint, load_checkpoint,
+                      ordered_map, save_checkpoint)
+
+SAMPLE_FAILURES = 5  # failures kept per validator for the summary
+
 
 def random_graph(rng: random.Random) -> Dict:
     n_parts = rng.choice([3, 4, 5, 6, 7])
@@ -41,23 +64,47 @@ def random_graph(rng: random.Random) -> Dict:
     return {"graph": G, "spec": spec}
 
 
-def run(seed: int, n_graphs: int, out_path: str) -> int:
-    rng = random.Random(seed)
+def graph_rng(seed: int, k: int) -> random.Random:
+    """RNG for graph k of a sweep, derived from (seed, k) alone."""
+    return random.Random(f"{seed}:{k}")
+
+
+def validate_graph(seed: int, k: int) -> Dict:
+    """Build graph k of the sweep and run every validator on it."""
+    built = random_graph(graph_rng(seed, k))
+    G, spec = built["graph"], built["spec"]
+    return {"graph_index": k, "spec": spec,
+            "results": [vfn(G) for vfn in ALL_VALIDATORS]}
+
+
+def run(seed: int, n_graphs: int, out_path: str, workers: int = 1,
+        stream: bool = False, checkpoint: Optional[str] = None,
+        checkpoint_every: int = 100) -> int:
     t0 = time.time()
 
     per = defaultdict(lambda: {"passed": 0, "failed": 0, "checks": 0,
                               "failures": []})
-    graph_reports: List[Dict] = []
     total_checks = 0
     all_passed = True
-
-    for k in range(n_graphs):
-        built = random_graph(rng)
-        G, spec = built["graph"], built["spec"]
-        results = []
-        for vfn in ALL_VALIDATORS:
-            r = vfn(G)
-            results.append(r)
+    start = 0
+    elapsed_before = 0.0
+
+    args = {"seed": seed, "n_graphs": n_graphs, "out": out_path,
+            "stream": stream}
+    state = load_checkpoint(checkpoint, args)
+    if state is not None:
+        per.update(state["per"])
+        total_checks = state["total_checks"]
+        all_passed = state["all_passed"]
+        start = state["done"]
+        elapsed_before = state["elapsed"]
+        print(f"  resuming from {checkpoint} at graph {start}")
+    sink = ReportSink(out_path, "graph", stream, checkpoint, state)
+
+    task = functools.partial(validate_graph, seed)
+    for gr in ordered_map(task, range(start, n_graphs), workers):
+        k, spec = gr["graph_index"], gr["spec"]
+        for r in gr["results"]:
             agg = per[r["name"]]
             agg["checks"] += r["checks"]
             total_checks += r["checks"]
@@ -67,10 +114,17 @@ def run(seed: int, n_graphs: int, out_path: str) -> int:
                 agg["failed"] += 1
                 all_passed = False
                 for f in r["failures"]:
-                    agg["failures"].append({"graph_index": k, "spec": spec,
-                                            "failure": f})
-        graph_reports.append({"graph_index": k, "spec": spec,
-                              "results": results})
+                    if len(agg["failures"]) < SAMPLE_FAILURES:
+                        agg["failures"].append({"graph_index": k,
+                                                "spec": spec,
+                                                "failure": f})
+        sink.add(gr)
+        if checkpoint and (k + 1) % checkpoint_every == 0:
+            state = {"args": args, "done": k + 1, "per": per,
+                     "total_checks": total_checks,
+                     "all_passed": all_passed,
+                     "elapsed": elapsed_before + time.time() - t0}
+            save_checkpoint(checkpoint, sink.mark(state))
 
     # standalone witnesses (fixed constructions, run once)
     standalone = []
@@ -86,9 +140,10 @@ def run(seed: int, n_graphs: int, out_path: str) -> int:
             agg["failed"] += 1
             all_passed = False
             for f in r["failures"]:
-                agg["failures"].append({"standalone": True, "failure": f})
+                if len(agg["failures"]) < SAMPLE_FAILURES:
+                    agg["failures"].append({"standalone": True, "failure": f})
 
-    elapsed = time.time() - t0
+    elapsed = elapsed_before + time.time() - t0
 
     summary = {}
     for name, agg in per.items():
@@ -97,7 +152,7 @@ def run(seed: int, n_graphs: int, out_path: str) -> int:
             "graphs_failed": agg["failed"],
             "total_checks": agg["checks"],
             "passed": agg["failed"] == 0,
-            "sample_failures": agg["failures"][:5],
+            "sample_failures": agg["failures"],
         }
 
     report = {
@@ -116,17 +171,17 @@ def run(seed: int, n_graphs: int, out_path: str) -> int:
         "overall_passed": all_passed,
         "summary_by_theorem": summary,
         "standalone_witnesses": standalone,
-        "graphs": graph_reports,
     }
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2)
+    sink.finish(report)
+    clear_checkpoint(checkpoint)
 
     print("Finite Contact Graphs -- validation suite")
     print(f"  graphs swept : {n_graphs}")
     print(f"  total checks : {total_checks}")
     print(f"  elapsed      : {elapsed:.3f}s")
     print(f"  seed         : {seed}")
+    print(f"  workers      : {workers}")
     print("-" * 64)
     for name, s in summary.items():
         flag = "PASS" if s["passed"] else "FAIL"
@@ -144,8 +199,16 @@ def main() -> int:
     ap.add_argument("--seed", type=int, default=20260623)
     ap.add_argument("--graphs", type=int, default=300)
     ap.add_argument("--out", type=str, default="validation_results.json")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="process-pool size for the sweep (1 = serial)")
+    ap.add_argument("--stream", action="store_true",
+                    help="write JSON Lines, one record per graph as it completes")
+    ap.add_argument("--checkpoint", type=str, default=None,
+                    help="checkpoint file; resumed from if it exists")
+    ap.add_argument("--checkpoint-every", type=int, default=100)
     args = ap.parse_args()
-    return run(args.seed, args.graphs, args.out)
+    return run(args.seed, args.graphs, args.out, args.workers, args.stream,
+               args.checkpoint, args.checkpoint_every)
 
 
 if __name__ == "__main__":
@@ -49,9 +49,9 @@ def v_ground_floor(G: ContactGraph) -> Dict:
         return {"name": "ground_floor_from_infinitude", "passed": True,
                 "checks": 0, "failures": [], "claim": "derived positive floor",
                 "evidence": {"skipped": "disconnected"}}
-    for U in proper_parts(G, 120):
+    bs = G.boundary_costs(proper_parts(G, 120)).tolist()
+    for b in bs:
         checks += 1
-        b = G.boundary_cost(U)
         # a thing (proper part) has a positive identification residual >= floor
         if b < G.floor - 1e-12:
             failures.append(f"boundary cost {b} < floor {G.floor}")
@@ -65,9 +65,7 @@ def v_ground_floor(G: ContactGraph) -> Dict:
         "passed": not failures,
         "checks": checks,
         "failures": failures[:10],
-        "evidence": {"floor": G.floor, "min_boundary_cost":
-                     min((G.boundary_cost(U) for U in proper_parts(G, 120)),
-                         default=None)},
+        "evidence": {"floor": G.floor, "min_boundary_cost": min(bs, default=None)},
     }
 
 
@@ -83,9 +81,8 @@ def v_T0_floor(G: ContactGraph) -> Dict:
                 "evidence": {"skipped": "disconnected"}}
     sharp = 0
     minc = float("inf")
-    for U in proper_parts(G, 150):
+    for c in G.cut_weights(proper_parts(G, 150)).tolist():
         checks += 1
-        c = G.cut_weight(U)
         minc = min(minc, c)
         if c == 0.0:
             sharp += 1
@@ -496,9 +493,7 @@ def v_measurement(G: ContactGraph) -> Dict:
         # add a new heavy boundary edge from part to a far vertex (a finer cut)
         far = max(G.vertices)
         if far not in (part, G.medium) and G.w(part, far) == 0:
-            neww = dict(G.weight)
-            neww[cg._e(part, far)] = G.floor * 2
-            Gp = ContactGraph(G.vertices, neww, G.floor, G.medium)
+            Gp = G.with_edge(part, far, G.floor * 2)
             sig_after, _ = Gp.separation_from_medium(part)
             if sig_after < sig_before - 1e-9:
                 failures.append("adding a boundary edge decreased separation")
@@ -0,0 +1,146 @@
+"""
+sweep_io.py -- report output, checkpoints and the worker pool shared by the
+randomized validation runners (artificial-structures and
+irreducible-bounded-phase-space).
+
+A sweep validates items 0..n-1 (graphs, spaces), each from its own RNG, and
+folds every item report into running aggregates. This module owns the parts
+of that loop whose format has to stay the same in every runner:
+
+  ordered_map       item reports in index order, serially or over a pool
+  ReportSink        where item reports go: a JSON Lines stream (--stream),
+                    or an in-memory list that is also spooled to
+                    CHECKPOINT.<items>.jsonl when checkpointing
+  load_checkpoint   the saved state to resume from (None if there is none)
+  save_checkpoint   atomic write of the state
+  clear_checkpoint  remove the checkpoint once the report is written
+
+A checkpoint is one JSON object: the runner's "args" (which must match on
+resume), "done" (items completed), the runner's own aggregates, and the
+sink's byte offset -- "stream_offset" into the --stream output or
+"spool_offset" into the spool. On resume anything past that offset was
+written after the checkpoint and is truncated, so the finished report is
+the same as an uninterrupted run's.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+def jsonl(f, record: Dict) -> None:
+    """Write one compact JSON Lines record and flush it."""
+    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    f.flush()
+
+
+def ordered_map(task: Callable, todo: range, workers: int = 1) -> Iterator:
+    """task(k) for k in todo, in index order. With workers > 1 the items are
+    sharded across a process pool; imap keeps index order, so aggregates are
+    merged exactly as in a serial run."""
+    if workers <= 1:
+        yield from map(task, todo)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        chunk = max(1, len(todo) // (workers * 8))
+        yield from pool.imap(task, todo, chunksize=chunk)
+
+
+def load_checkpoint(path: Optional[str], args: Dict) -> Optional[Dict]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state["args"] != args:
+        raise ValueError(f"checkpoint {path} was written for {state['args']}, "
+                         f"not {args}")
+    return state
+
+
+def save_checkpoint(path: str, state: Dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)  # atomic: a crash never leaves a torn checkpoint
+
+
+def clear_checkpoint(path: Optional[str]) -> None:
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+class ReportSink:
+    """Destination of the item reports of one sweep.
+
+    record : JSON Lines record type of an item ("graph", "space"); its
+             plural names the spool file and the report's item list.
+
+    With stream, each report is written to out_path as a
+    {"record": record, ...} line as it completes. Otherwise reports are
+    kept in `reports`; with a checkpoint they are also appended to
+    checkpoint + ".<record>s.jsonl", so a checkpoint records only the
+    spool's length instead of re-saving every report. `state` is the
+    loaded checkpoint, if resuming.
+    """
+
+    def __init__(self, out_path: str, record: str, stream: bool = False,
+                 checkpoint: Optional[str] = None,
+                 state: Optional[Dict] = None):
+        self.out_path = out_path
+        self.record = record
+        self.reports: List[Dict] = []
+        self.stream = None
+        self.spool = None
+        if stream:
+            if state is not None:
+                # drop any records written after the checkpoint, then append
+                self.stream = open(out_path, "r+", encoding="utf-8")
+                self.stream.seek(state["stream_offset"])
+                self.stream.truncate()
+            else:
+                self.stream = open(out_path, "w", encoding="utf-8")
+        elif checkpoint:
+            self.spool = open(f"{checkpoint}.{record}s.jsonl",
+                              "r+b" if state is not None else "wb")
+            if state is not None:
+                self.reports = [json.loads(line) for line in
+                                self.spool.read(state["spool_offset"])
+                                .splitlines()]
+                self.spool.seek(state["spool_offset"])
+                self.spool.truncate()
+
+    def add(self, report: Dict) -> None:
+        if self.stream is not None:
+            jsonl(self.stream, {"record": self.record, **report})
+            return
+        self.reports.append(report)
+        if self.spool is not None:
+            self.spool.write((json.dumps(report, separators=(",", ":"))
+                              + "\n").encode("utf-8"))
+
+    def mark(self, state: Dict) -> Dict:
+        """Add this sink's resume offset to a checkpoint state."""
+        if self.stream is not None:
+            state["stream_offset"] = self.stream.tell()
+        elif self.spool is not None:
+            self.spool.flush()
+            state["spool_offset"] = self.spool.tell()
+        return state
+
+    def finish(self, report: Dict) -> None:
+        """Write the final report -- a {"record": "summary"} line when
+        streaming, else one JSON document with the item reports under
+        "<record>s" -- and remove the spool."""
+        if self.stream is not None:
+            jsonl(self.stream, {"record": "summary", **report})
+            self.stream.close()
+        else:
+            report[self.record + "s"] = self.reports
+            with open(self.out_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        if self.spool is not None:
+            self.spool.close()
+            os.remove(self.spool.name)
@@ -10,84 +10,250 @@ a grid of atoms (the underlying continuum sampled finely), a measure
 diameter >= delta. This is exactly the embedded-agent picture: the agent
 can only ever name unions of cells, never sub-cell sets.
 
+The partition is stored as an integer label array over the lattice box
+(label = cell id, -1 where there is no atom), and regions are boolean masks
+of the same shape, so measures, complements and separators are vectorised
+array operations. Atom sets (frozensets of coordinate tuples) are still
+accepted wherever a region is expected.
+
 All theorem-validators in this suite operate on instances of `Space`.
 No randomness lives here; randomized sweeps live in the runner.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from itertools import product
+from dataclasses import dataclass
+from functools import cached_property
 from math import sqrt
-from typing import Dict, FrozenSet, Iterable, List, Sequence, Set, Tuple
+from typing import FrozenSet, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
 
 Atom = Tuple[int, ...]  # integer lattice coordinate of a sampled point
+Region = Union[FrozenSet[Atom], np.ndarray]  # atom set, or boolean atom mask
 
 
 # ---------------------------------------------------------------------
 #  The space
 # ---------------------------------------------------------------------
-@dataclass
+@dataclass(eq=False)
 class Space:
     """A bounded resolvable space realised on a finite integer lattice.
 
-    atoms       : the sampled points of the bounded continuum.
+    labels      : N-D integer array over the lattice box; labels[site] is
+                  the id of the cell holding that atom, -1 where no atom.
     weight      : measure of each atom (mu of a single atom).
-    cells       : partition -> list of frozensets of atoms (the realisable
-                  grain; an agent names only unions of these).
     delta       : the resolution (min cell diameter in lattice units).
+    origin      : lattice coordinate of labels[0, ..., 0].
+
+    `atoms` (frozenset of coordinates) and `cells` (list of frozensets, the
+    realisable grain) are derived from `labels` on first use. Code written
+    against the old (atoms, weight, cells, delta) constructor should call
+    Space.from_cells with the same arguments.
     """
 
-    atoms: FrozenSet[Atom]
+    labels: np.ndarray
     weight: float
-    cells: List[FrozenSet[Atom]]
     delta: float
+    origin: Tuple[int, ...] = ()
+
+    def __post_init__(self):
+        if not self.origin:
+            self.origin = (0,) * self.labels.ndim
+
+    @classmethod
+    def from_cells(cls, atoms: Iterable[Atom], weight: float,
+                   cells: Sequence[FrozenSet[Atom]], delta: float) -> "Space":
+        """Build from an explicit atom set and partition (cell i -> id i);
+        the argument order of the original Space(atoms, weight, cells,
+        delta) constructor."""
+        atoms = frozenset(atoms)
+        pts = np.array(sorted(atoms))
+        lo = pts.min(axis=0)
+        labels = np.full(tuple(pts.max(axis=0) - lo + 1), -1, dtype=np.int64)
+        for i, c in enumerate(cells):
+            labels[tuple((np.array(list(c)) - lo).T)] = i
+        sp = cls(labels, weight, delta, tuple(int(x) for x in lo))
+        # keep the caller's objects (and their iteration order)
+        sp.__dict__["atoms"] = atoms
+        sp.__dict__["cells"] = list(cells)
+        return sp
+
+    # --- compact representation ---
+    @cached_property
+    def atom_mask(self) -> np.ndarray:
+        """Boolean mask of lattice sites that are atoms (the whole, Omega)."""
+        return self.labels >= 0
+
+    @cached_property
+    def atom_sites(self) -> np.ndarray:
+        """Flat (row-major) lattice index of every atom, ascending."""
+        return np.flatnonzero(self.atom_mask)
+
+    @property
+    def n_atoms(self) -> int:
+        return len(self.atom_sites)
+
+    @cached_property
+    def n_cells(self) -> int:
+        return int(self.labels.max()) + 1
+
+    @cached_property
+    def cell_sizes(self) -> np.ndarray:
+        """Number of atoms in each cell, indexed by cell id."""
+        return np.bincount(self.labels.ravel()[self.atom_sites],
+                           minlength=self.n_cells)
+
+    def site(self, a: Atom) -> Tuple[int, ...]:
+        """Index into `labels` (and any region mask) of atom a."""
+        return tuple(x - o for x, o in zip(a, self.origin))
+
+    def atoms_in(self, region: np.ndarray) -> List[Atom]:
+        """Coordinates of the atoms of a mask, in row-major order."""
+        return [tuple(p) for p in (np.argwhere(region) + self.origin).tolist()]
+
+    def mask(self, region: Region) -> np.ndarray:
+        """Boolean atom mask for a region given as a mask or an atom set."""
+        if isinstance(region, np.ndarray):
+            return region
+        m = np.zeros(self.labels.shape, dtype=bool)
+        pts = list(region)
+        if pts:
+            m[tuple((np.array(pts) - self.origin).T)] = True
+        return m
+
+    @cached_property
+    def atoms(self) -> FrozenSet[Atom]:
+        return frozenset(self.atoms_in(self.atom_mask))
+
+    @cached_property
+    def cells(self) -> List[FrozenSet[Atom]]:
+        sites = self.atom_sites
+        order = np.argsort(self.labels.ravel()[sites], kind="stable")
+        coords = np.column_stack(np.unravel_index(sites[order],
+                                                  self.labels.shape))
+        coords = (coords + self.origin).tolist()
+        bounds = np.cumsum(self.cell_sizes)[:-1].tolist()
+        starts = [0] + bounds
+        ends = bounds + [len(coords)]
+        return [frozenset(tuple(p) for p in coords[s:e])
+                for s, e in zip(starts, ends)]
+
+    @cached_property
+    def cell_edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Cell adjacency graph: parallel id arrays (u < v), one entry per
+        pair of distinct cells holding lattice-adjacent atoms."""
+        lab = self.labels
+        n = self.n_cells
+        keys = []
+        for ax in range(lab.ndim):
+            a = np.moveaxis(lab, ax, 0)
+            x, y = a[:-1].ravel(), a[1:].ravel()
+            keep = (x >= 0) & (y >= 0) & (x != y)
+            x, y = x[keep], y[keep]
+            keys.append(np.minimum(x, y) * n + np.maximum(x, y))
+        pairs = np.unique(np.concatenate(keys))
+        return pairs // n, pairs % n
+
+    @cached_property
+    def site_neighbours(self) -> np.ndarray:
+        """(n_sites, 2*dim) flat indices of each site's lattice neighbours
+        that are atoms, -1 where off the box or not an atom."""
+        lab = self.labels
+        flat = np.arange(lab.size).reshape(lab.shape)
+        cols = []
+        for ax in range(lab.ndim):
+            lo = [slice(None)] * lab.ndim
+            hi = [slice(None)] * lab.ndim
+            lo[ax] = slice(None, -1)
+            hi[ax] = slice(1, None)
+            for dst, src in ((hi, lo), (lo, hi)):
+                nb = np.full(lab.shape, -1, dtype=np.intp)
+                nb[tuple(dst)] = flat[tuple(src)]
+                cols.append(nb.ravel())
+        nbrs = np.stack(cols, axis=1)
+        nbrs[(nbrs >= 0) & (lab.ravel()[nbrs] < 0)] = -1
+        return nbrs
+
+    @cached_property
+    def cell_sites(self) -> List[np.ndarray]:
+        """Flat lattice indices of the atoms of each cell, by cell id."""
+        sites = self.atom_sites
+        order = np.argsort(self.labels.ravel()[sites], kind="stable")
+        return np.split(sites[order], np.cumsum(self.cell_sizes)[:-1])
 
     # --- measure ---
-    def mu(self, region: Iterable[Atom]) -> float:
-        return self.weight * len(set(region))
+    def mu(self, region: Region) -> float:
+        if isinstance(region, np.ndarray):
+            return self.weight * int(np.count_nonzero(region))
+        if not isinstance(region, (set, frozenset)):
+            region = set(region)
+        return self.weight * len(region)
 
     @property
     def total_measure(self) -> float:
-        return self.mu(self.atoms)
+        return self.weight * self.n_atoms
 
     @property
     def mu_min(self) -> float:
         """Minimum cell measure -- the lower bound the floor must clear."""
-        return min(self.mu(c) for c in self.cells)
+        return self.weight * int(self.cell_sizes.min())
 
     # --- adjacency (4/6/2n-neighbourhood on the lattice) ---
     def neighbours(self, a: Atom) -> List[Atom]:
         out = []
+        s = self.site(a)
         for i in range(len(a)):
             for step in (-1, 1):
-                b = list(a)
-                b[i] += step
-                b = tuple(b)
-                if b in self.atoms:
-                    out.append(b)
+                j = s[i] + step
+                if 0 <= j < self.labels.shape[i]:
+                    t = s[:i] + (j,) + s[i + 1:]
+                    if self.labels[t] >= 0:
+                        b = list(a)
+                        b[i] += step
+                        out.append(tuple(b))
         return out
 
     def is_connected(self) -> bool:
-        if not self.atoms:
+        if not self.n_atoms:
             return True
-        start = next(iter(self.atoms))
-        seen = {start}
-        stack = [start]
-        while stack:
-            x = stack.pop()
-            for y in self.neighbours(x):
-                if y not in seen:
-                    seen.add(y)
-                    stack.append(y)
-        return len(seen) == len(self.atoms)
-
-    # --- cell lookup ---
+        seen = np.zeros(self.labels.shape, dtype=bool)
+        seen.flat[self.atom_sites[0]] = True
+        frontier = seen
+        while frontier.any():
+            frontier = _dilate(frontier) & self.atom_mask & ~seen
+            seen |= frontier
+        return int(np.count_nonzero(seen)) == self.n_atoms
+
+    # --- cell lookup (the label array is the atom -> cell index) ---
     def cell_of(self, a: Atom) -> int:
-        for idx, c in enumerate(self.cells):
-            if a in c:
-                return idx
-        raise KeyError(a)
+        return int(self.cells_of([a])[0])
+
+    def cells_of(self, atoms) -> np.ndarray:
+        """Cell id of each atom (an iterable of coordinates or an (n, dim)
+        array), as an integer array. KeyError for a non-atom."""
+        pts = np.asarray(atoms if isinstance(atoms, np.ndarray) else list(atoms),
+                         dtype=np.intp).reshape(-1, self.labels.ndim)
+        idx = pts - np.asarray(self.origin, dtype=np.intp)
+        inside = ((idx >= 0) & (idx < self.labels.shape)).all(axis=1)
+        ids = np.full(len(idx), -1, dtype=self.labels.dtype)
+        ids[inside] = self.labels[tuple(idx[inside].T)]
+        if (ids < 0).any():
+            raise KeyError(tuple(pts[np.argmax(ids < 0)].tolist()))
+        return ids
+
+
+def _dilate(m: np.ndarray) -> np.ndarray:
+    """m plus every lattice site one axis-step from it (no wrap-around)."""
+    out = m.copy()
+    for ax in range(m.ndim):
+        lo = [slice(None)] * m.ndim
+        hi = [slice(None)] * m.ndim
+        lo[ax] = slice(None, -1)
+        hi[ax] = slice(1, None)
+        out[tuple(hi)] |= m[tuple(lo)]
+        out[tuple(lo)] |= m[tuple(hi)]
+    return out
 
 
 # ---------------------------------------------------------------------
@@ -97,61 +263,208 @@ def make_box(shape: Sequence[int], cell_side: int, weight: float = 1.0) -> Space
     """A box [0,shape_0) x ... sampled on the integer lattice, partitioned
     into axis-aligned cells of side `cell_side`. Each cell has diameter
     >= cell_side (delta), so BRS2 (finite resolution) holds by construction.
+    Cells are numbered row-major over the grid of cells.
     """
-    ranges = [range(s) for s in shape]
-    atoms: Set[Atom] = set(product(*ranges))
     # group atoms into cells by integer division of each coordinate
-    buckets: Dict[Atom, Set[Atom]] = {}
-    for a in atoms:
-        key = tuple(coord // cell_side for coord in a)
-        buckets.setdefault(key, set()).add(a)
-    cells = [frozenset(s) for s in buckets.values()]
+    grid = tuple(-(-s // cell_side) for s in shape)
+    labels = np.ravel_multi_index(np.indices(tuple(shape)) // cell_side, grid)
     delta = float(cell_side)
-    return Space(frozenset(atoms), weight, cells, delta)
+    return Space(labels, weight, delta)
 
 
 # ---------------------------------------------------------------------
 #  Regions, complements, separators  (Defs in Sec. 1)
 # ---------------------------------------------------------------------
-def complement(sp: Space, region: FrozenSet[Atom]) -> FrozenSet[Atom]:
-    """Negation-sequence N(A) = Omega \\ A  (Def: negation-sequence)."""
+def complement(sp: Space, region: Region) -> Region:
+    """Negation-sequence N(A) = Omega \\ A  (Def: negation-sequence).
+    A mask in gives a mask out; an atom set gives an atom set."""
+    if isinstance(region, np.ndarray):
+        return sp.atom_mask & ~region
     return frozenset(sp.atoms - set(region))
 
 
-def realisable_region_from_cells(sp: Space, cell_idxs: Iterable[int]) -> FrozenSet[Atom]:
-    """A Part-realisable region: a union of whole cells."""
-    out: Set[Atom] = set()
-    for i in cell_idxs:
-        out |= set(sp.cells[i])
-    return frozenset(out)
+def realisable_region_from_cells(sp: Space, cell_idxs) -> np.ndarray:
+    """A Part-realisable region: a union of whole cells (as an atom mask).
+    Cells are named by ids or by a boolean mask over cell ids."""
+    sel = np.zeros(sp.n_cells + 1, dtype=bool)  # last slot: label -1
+    if isinstance(cell_idxs, np.ndarray) and cell_idxs.dtype == bool:
+        sel[:-1] = cell_idxs
+    else:
+        sel[list(cell_idxs)] = True
+    return sel[sp.labels]
 
 
-def separator_cells(sp: Space, region: FrozenSet[Atom]) -> List[int]:
+def separator_cells(sp: Space, region: Region) -> List[int]:
     """Sigma_Part(A): indices of cells bordering BOTH A and its complement.
 
     A cell borders A if it contains, or is lattice-adjacent to, an atom of A.
     For a realisable A (union of cells), a cell is a separator cell iff it
-    is adjacent to a cell on the other side of the A/complement divide.
+    is adjacent to a cell on the other side of the A/complement divide, so
+    such regions are answered on the cell graph (separator_cells_from_cells).
     """
-    comp = complement(sp, region)
-    sep: List[int] = []
-    for idx, c in enumerate(sp.cells):
-        touches_A = any((a in region) or any(n in region for n in sp.neighbours(a))
-                        for a in c)
-        touches_C = any((a in comp) or any(n in comp for n in sp.neighbours(a))
-                        for a in c)
-        if touches_A and touches_C:
-            sep.append(idx)
-    return sep
-
-
-def separator_atoms(sp: Space, region: FrozenSet[Atom]) -> FrozenSet[Atom]:
-    out: Set[Atom] = set()
-    for i in separator_cells(sp, region):
-        out |= set(sp.cells[i])
-    return frozenset(out)
-
-
-def boundary_thickness(sp: Space, region: FrozenSet[Atom]) -> float:
+    A = sp.mask(region)
+    counts = np.bincount(sp.labels[A], minlength=sp.n_cells)
+    if np.all((counts == 0) | (counts == sp.cell_sizes)):
+        return separator_cells_from_cells(sp, counts > 0)
+    comp = complement(sp, A)
+    lab = sp.labels
+    touches_A = np.bincount(lab[_dilate(A) & sp.atom_mask],
+                            minlength=sp.n_cells) > 0
+    touches_C = np.bincount(lab[_dilate(comp) & sp.atom_mask],
+                            minlength=sp.n_cells) > 0
+    return np.flatnonzero(touches_A & touches_C).tolist()
+
+
+def separator_cells_from_cells(sp: Space, cells) -> List[int]:
+    """Sigma_Part of the realisable region named by `cells` (cell ids, or a
+    boolean mask over cell ids), in O(cells + cell-edges): the endpoints of
+    every cell-graph edge that crosses the divide."""
+    if isinstance(cells, np.ndarray) and cells.dtype == bool:
+        in_A = cells
+    else:
+        in_A = np.zeros(sp.n_cells, dtype=bool)
+        in_A[list(cells)] = True
+    u, v = sp.cell_edges
+    cross = in_A[u] != in_A[v]
+    sep = np.zeros(sp.n_cells, dtype=bool)
+    sep[u[cross]] = True
+    sep[v[cross]] = True
+    return np.flatnonzero(sep).tolist()
+
+
+def separator_atoms(sp: Space, region: Region) -> np.ndarray:
+    return realisable_region_from_cells(sp, separator_cells(sp, region))
+
+
+def boundary_thickness(sp: Space, region: Region) -> float:
     """beta_Part(A) = mu(Sigma_Part(A))  (Def: boundary thickness)."""
-    return sp.mu(separator_atoms(sp, region))
+    return sp.weight * int(sp.cell_sizes[separator_cells(sp, region)].sum())
+
+
+# ---------------------------------------------------------------------
+#  Incremental regions (sorites growth)
+# ---------------------------------------------------------------------
+class GrowingRegion:
+    """A region A under single-atom (or whole-cell) insertion and removal,
+    with Sigma_Part(A), beta = mu(Sigma), sigma = mu(A), the interior
+    mu(A minus Sigma) and tau = beta/sigma kept current.
+
+    A cell is in Sigma iff some atom of it lies in or next to A, and some
+    atom of it lies in or next to the complement. Per site we count how many
+    atoms of its closed neighbourhood are in A / in the complement, and per
+    cell how many of its sites see each side, so flipping one atom touches
+    only its 2*dim + 1 neighbourhood and the cells those sites belong to.
+    """
+
+    def __init__(self, sp: Space, region: Region = None):
+        self.sp = sp
+        A = (np.zeros(sp.labels.shape, dtype=bool) if region is None
+             else sp.mask(region).copy())
+        self._A = A
+        flat_A = A.ravel()
+        nbrs = sp.site_neighbours
+        closed = np.column_stack([np.arange(len(nbrs)), nbrs])
+        closed[~sp.atom_mask.ravel()] = -1
+        is_atom = sp.atom_mask.ravel()
+        in_A = np.append(flat_A, False)[closed].sum(axis=1)
+        in_C = np.append(is_atom & ~flat_A, False)[closed].sum(axis=1)
+        lab = sp.labels.ravel()
+        n = sp.n_cells
+        atoms = sp.atom_sites
+        self._lab = lab.tolist()
+        self._closed = [row[row >= 0].tolist() for row in closed]
+        self._in_A = in_A.tolist()
+        self._in_C = in_C.tolist()
+        self._sees_A = np.bincount(lab[atoms[in_A[atoms] > 0]],
+                                   minlength=n).tolist()
+        self._sees_C = np.bincount(lab[atoms[in_C[atoms] > 0]],
+                                   minlength=n).tolist()
+        self._cell_A = np.bincount(lab[flat_A], minlength=n).tolist()
+        self._sizes = sp.cell_sizes.tolist()
+        self._sep = [a > 0 and c > 0
+                     for a, c in zip(self._sees_A, self._sees_C)]
+        self._n_A = int(np.count_nonzero(flat_A))
+        self._n_sep = sum(s for s, on in zip(self._sizes, self._sep) if on)
+        self._n_interior = self._n_A - sum(
+            k for k, on in zip(self._cell_A, self._sep) if on)
+
+    # --- updates ---
+    def add(self, a: Atom) -> None:
+        self.add_site(int(np.ravel_multi_index(self.sp.site(a),
+                                               self._A.shape)))
+
+    def remove(self, a: Atom) -> None:
+        self.remove_site(int(np.ravel_multi_index(self.sp.site(a),
+                                                  self._A.shape)))
+
+    def add_cell(self, c: int) -> None:
+        for s in self.sp.cell_sites[c].tolist():
+            self.add_site(s)
+
+    def remove_cell(self, c: int) -> None:
+        for s in self.sp.cell_sites[c].tolist():
+            self.remove_site(s)
+
+    def add_site(self, s: int) -> None:
+        """Insert the atom at flat lattice index s (no-op if already in A)."""
+        if self._A.flat[s] or self._lab[s] < 0:
+            return
+        self._A.flat[s] = True
+        self._shift(s, +1)
+
+    def remove_site(self, s: int) -> None:
+        if not self._A.flat[s]:
+            return
+        self._A.flat[s] = False
+        self._shift(s, -1)
+
+    def _shift(self, s: int, d: int) -> None:
+        lab, in_A, in_C = self._lab, self._in_A, self._in_C
+        c = lab[s]
+        self._n_A += d
+        self._cell_A[c] += d
+        if not self._sep[c]:
+            self._n_interior += d
+        touched = set()
+        for x in self._closed[s]:
+            in_A[x] += d
+            in_C[x] -= d
+            if in_A[x] == (1 if d > 0 else 0):
+                self._sees_A[lab[x]] += d
+                touched.add(lab[x])
+            if in_C[x] == (0 if d > 0 else 1):
+                self._sees_C[lab[x]] -= d
+                touched.add(lab[x])
+        for c in touched:
+            on = self._sees_A[c] > 0 and self._sees_C[c] > 0
+            if on != self._sep[c]:
+                self._sep[c] = on
+                sign = 1 if on else -1
+                self._n_sep += sign * self._sizes[c]
+                self._n_interior -= sign * self._cell_A[c]
+
+    # --- readouts ---
+    @property
+    def mask(self) -> np.ndarray:
+        """The current region (live view; copy before keeping it)."""
+        return self._A
+
+    @property
+    def separator_cells(self) -> List[int]:
+        return [c for c, on in enumerate(self._sep) if on]
+
+    @property
+    def sigma(self) -> float:
+        return self.sp.weight * self._n_A
+
+    @property
+    def beta(self) -> float:
+        return self.sp.weight * self._n_sep
+
+    @property
+    def interior(self) -> float:
+        return self.sp.weight * self._n_interior
+
+    @property
+    def tau(self) -> float:
+        return self.beta / self.sigma if self._n_A else float("inf")
@@ -0,0 +1,61 @@
+"""
+check_from_cells.py -- consistency check for the old-style Space entry point.
+
+Space.from_cells(atoms, weight, cells, delta) takes the arguments of the
+original Space constructor. For the first --spaces spaces of the default
+sweep this rebuilds each space from its atom set and cell list, and checks
+that the label array, origin and measures match and that every validator
+returns the same result on both.
+
+Usage:
+    python check_from_cells.py [--seed N] [--spaces K]
+
+Exit code 0 iff every space round-trips.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+import numpy as np
+
+import brs
+from run_validation import random_space, space_rng
+from validators import ALL_VALIDATORS, SpaceAnalysis
+
+
+def check_space(sp: brs.Space) -> list:
+    """Mismatches between sp and its from_cells rebuild (empty if none)."""
+    rebuilt = brs.Space.from_cells(sp.atoms, sp.weight, sp.cells, sp.delta)
+    problems = []
+    if not np.array_equal(rebuilt.labels, sp.labels):
+        problems.append("labels differ")
+    if rebuilt.origin != sp.origin:
+        problems.append(f"origin {rebuilt.origin} != {sp.origin}")
+    if (rebuilt.total_measure, rebuilt.mu_min) != (sp.total_measure, sp.mu_min):
+        problems.append("measures differ")
+    ctx, ctx_rebuilt = SpaceAnalysis(sp), SpaceAnalysis(rebuilt)
+    for vfn in ALL_VALIDATORS:
+        if vfn(sp, ctx) != vfn(rebuilt, ctx_rebuilt):
+            problems.append(f"{vfn.__name__} differs")
+    return problems
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seed", type=int, default=20260619)
+    ap.add_argument("--spaces", type=int, default=20)
+    args = ap.parse_args()
+    failed = 0
+    for k in range(args.spaces):
+        problems = check_space(random_space(space_rng(args.seed, k))["space"])
+        if problems:
+            failed += 1
+            print(f"  space {k}: {'; '.join(problems)}")
+    print(f"from_cells round trip: {args.spaces - failed}/{args.spaces} spaces OK")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,8 @@ import math
 import random
 from typing import Dict, List
 
+import numpy as np
+
 import brs
 from brs import (boundary_thickness, complement, realisable_region_from_cells,
                  separator_atoms, separator_cells)
@@ -46,7 +48,7 @@ def panel1() -> Dict:
             mumin.append(sp.mu_min)
             ratio.append(t / sp.mu_min)
             scale.append(sp.mu(A))
-        grid_nc.append(len(sp.cells))
+        grid_nc.append(sp.n_cells)
         grid_mm.append(sp.mu_min)
         grid_mt.append(min(ts))
     return {
@@ -80,13 +82,15 @@ def panel2() -> Dict:
             sep = separator_cells(sp, A)
             if not sep:
                 continue
-            c = sp.cells[sep[0]]
-            half = frozenset(list(c)[: max(1, len(c) // 2)])
-            target = frozenset(set(A) | set(half))
-            named = [i for i, cc in enumerate(sp.cells) if set(cc) <= set(target)]
-            disc = frozenset(set(target) ^ set(realisable_region_from_cells(sp, named)))
-            if disc:
-                touched = {sp.cell_of(a) for a in disc}
+            c = sp.cell_sites[sep[0]]
+            target = A.copy()
+            target.flat[c[: max(1, len(c) // 2)]] = True
+            named = np.flatnonzero(
+                np.bincount(sp.labels[target], minlength=sp.n_cells)
+                == sp.cell_sizes)
+            disc = target ^ realisable_region_from_cells(sp, named)
+            if disc.any():
+                touched = np.unique(sp.labels[disc])
                 reps.append(sp.mu(realisable_region_from_cells(sp, touched)))
         rf = min(reps) if reps else gf
         cf = sp.mu_min  # cost floor = e^{-C} = mu_min by construction
@@ -117,8 +121,8 @@ def panel3() -> Dict:
         for A in sample_regions(sp, 50):
             sep = separator_atoms(sp, A)
             s = sp.mu(A)
-            bA = sp.mu(frozenset(set(A) & set(sep)))
-            it = sp.mu(frozenset(set(A) - set(sep)))
+            bA = sp.mu(A & sep)
+            it = sp.mu(A & ~sep)
             b_full = boundary_thickness(sp, A)
             sigma.append(s); betaA.append(bA); interior.append(it)
             tau.append(b_full / s if s else 0.0)
@@ -140,18 +144,16 @@ def panel3() -> Dict:
 def panel4() -> Dict:
     # accretive aggregate on a 2D box: grow one atom at a time, record tau, sigma
     sp = brs.make_box([12, 12], 2, 1.0)
-    order = sorted(sp.atoms)
-    grown = set()
+    order = sp.atom_sites.tolist()  # row-major == sorted coordinates
+    grown = brs.GrowingRegion(sp)
     step, sigma, beta, tau = [], [], [], []
     for n, a in enumerate(order):
-        grown.add(a)
-        A = frozenset(grown)
-        if not (0 < sp.mu(A) < sp.total_measure):
+        grown.add_site(a)
+        s = grown.sigma
+        if not (0 < s < sp.total_measure):
             continue
-        b = boundary_thickness(sp, A)
-        s = sp.mu(A)
         step.append(len(sigma))
-        sigma.append(s); beta.append(b); tau.append(b / s if s else 0.0)
+        sigma.append(s); beta.append(grown.beta); tau.append(grown.tau)
     # per-step jump in tau (no single decisive grain -> bounded once sigma>beta)
     djump = [abs(tau[i + 1] - tau[i]) for i in range(len(tau) - 1)]
     # 3D: three independent accretion orders -> tau curves
@@ -159,13 +161,12 @@ def panel4() -> Dict:
     for ci, seed in enumerate((1, 2, 3)):
         rng = random.Random(seed)
         o = sorted(sp.atoms, key=lambda p: rng.random())
-        g = set(); tser = []; sser = []
+        A = brs.GrowingRegion(sp); tser = []; sser = []
         for a in o:
-            g.add(a); A = frozenset(g)
-            if not (0 < sp.mu(A) < sp.total_measure):
+            A.add(a)
+            if not (0 < A.sigma < sp.total_measure):
                 continue
-            b = boundary_thickness(sp, A); s = sp.mu(A)
-            tser.append(b / s if s else 0.0); sser.append(s)
+            tser.append(A.tau); sser.append(A.sigma)
         curves[f"order_{ci}"] = {"sigma": sser, "tau": tser}
     return {
         "tau_descent": {"step": step, "tau": tau, "sigma": sigma},
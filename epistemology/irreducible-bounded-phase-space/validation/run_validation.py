@@ -6,7 +6,29 @@ cell size, atom weight) and runs every theorem-validator on each. Aggregates
 pass/fail across the whole sweep and writes a JSON report.
 
 Usage:
-    python run_validation.py [--seed N] [--spaces K] [--out results.json]
+    python run_validation.py [--seed N] [--spaces K] [--workers W]
+                             [--out results.json] [--stream]
+                             [--checkpoint ckpt.json] [--checkpoint-every C]
+                             [--profile profile.json]
+
+With --stream the report is JSON Lines: one compact {"record": "space"}
+line per space, flushed as it completes, then a final {"record": "summary"}
+line holding everything else. Only running aggregates stay in memory.
+
+Space k is drawn from its own RNG seeded by (seed, k), so the report is the
+same for any --workers count (apart from meta.elapsed_seconds). The report's
+meta.validator_profile holds each validator's histogram of per-space check
+counts over fixed bins, which depends only on the seed. Wall times are kept
+out of the report: --profile PATH writes the worker count and each
+validator's total wall time, share and per-space wall-time histogram to a
+separate JSON file.
+
+With --checkpoint PATH the completed-space count and running aggregates are
+saved every --checkpoint-every spaces; rerunning with the same seed,
+--spaces, --out and --stream resumes after the last saved space and produces
+the same report as an uninterrupted run. Without --stream the finished space reports are
+appended to PATH.spaces.jsonl as they complete and the checkpoint records
+only its length. Both files are removed on completion.
 
 Exit code 0 iff every check on every space passed.
 """
@@ -14,16 +36,32 @@ Exit code 0 iff every check on every space passed.
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import platform
 import random
 import sys
 import time
+from bisect import bisect_right
 from collections import defaultdict
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import brs
-from validators import ALL_VALIDATORS
+from validators import ALL_VALIDATORS, SpaceAnalysis
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "common"))
+from sweep_io import (ReportSink, clear_checkpoint, load_checkpoint,
+                      ordered_map, save_checkpoint)
+
+SAMPLE_FAILURES = 5  # failures kept per validator for the summary
+
+# Fixed histogram bins, so the profiles aggregate in O(1) per validator and
+# is checkpointed with the rest. counts[0] is below edges[0], counts[i] is
+# [edges[i-1], edges[i]), counts[-1] is at or above edges[-1].
+WALL_EDGES = [1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 0.01, 0.03, 0.1, 0.3,
+              1.0, 3.0, 10.0]  # seconds
+CHECK_EDGES = [0] + [2 ** e for e in range(11)]  # 0, 1, 2, 4, ..., 1024
 
 
 def random_space(rng: random.Random) -> Dict:
@@ -42,45 +80,88 @@ def random_space(rng: random.Random) -> Dict:
     weight = rng.choice([0.5, 1.0, 2.0])
     sp = brs.make_box(shape, cell_side, weight)
     spec = {"dim": dim, "shape": shape, "cell_side": cell_side,
-            "weight": weight, "n_atoms": len(sp.atoms),
-            "n_cells": len(sp.cells), "delta": sp.delta,
+            "weight": weight, "n_atoms": sp.n_atoms,
+            "n_cells": sp.n_cells, "delta": sp.delta,
             "mu_min": sp.mu_min, "total_measure": sp.total_measure,
             "connected": sp.is_connected()}
     return {"space": sp, "spec": spec}
 
 
-def run(seed: int, n_spaces: int, out_path: str) -> int:
-    rng = random.Random(seed)
+def validate_space(seed: int, k: int) -> Tuple[Dict, List[float]]:
+    """Build space k of the sweep and run every validator on it; returns the
+    space record and each validator's wall time in seconds."""
+    built = random_space(space_rng(seed, k))
+    sp, spec = built["space"], built["spec"]
+    ctx = SpaceAnalysis(sp)  # regions and separators shared by all validators
+    results, seconds = [], []
+    for vfn in ALL_VALIDATORS:
+        t = time.perf_counter()
+        results.append(vfn(sp, ctx))
+        seconds.append(time.perf_counter() - t)
+    return {"space_index": k, "spec": spec, "results": results}, seconds
+
+
+def space_rng(seed: int, k: int) -> random.Random:
+    """RNG for space k of a sweep, derived from (seed, k) alone."""
+    return random.Random(f"{seed}:{k}")
+
+
+def run(seed: int, n_spaces: int, out_path: str, workers: int = 1,
+        stream: bool = False, checkpoint: Optional[str] = None,
+        checkpoint_every: int = 50, profile_path: Optional[str] = None) -> int:
     t0 = time.time()
 
-    per_validator = defaultdict(lambda: {"passed": 0, "failed": 0,
-                                         "checks": 0, "failures": []})
-    space_reports: List[Dict] = []
+    per_validator = defaultdict(lambda: {
+        "passed": 0, "failed": 0, "checks": 0, "failures": [],
+        "seconds": 0.0, "wall_hist": [0] * (len(WALL_EDGES) + 1),
+        "checks_hist": [0] * (len(CHECK_EDGES) + 1)})
     total_checks = 0
     all_passed = True
+    start = 0
+    elapsed_before = 0.0
+
+    args = {"seed": seed, "n_spaces": n_spaces, "out": out_path,
+            "stream": stream}
+    state = load_checkpoint(checkpoint, args)
+    if state is not None:
+        per_validator.update(state["per_validator"])
+        total_checks = state["total_checks"]
+        all_passed = state["all_passed"]
+        start = state["done"]
+        elapsed_before = state["elapsed"]
+        print(f"  resuming from {checkpoint} at space {start}")
+    sink = ReportSink(out_path, "space", stream, checkpoint, state)
 
-    for k in range(n_spaces):
-        built = random_space(rng)
-        sp, spec = built["space"], built["spec"]
-        results = []
-        for vfn in ALL_VALIDATORS:
-            r = vfn(sp)
-            results.append(r)
+    task = functools.partial(validate_space, seed)
+    for sr, seconds in ordered_map(task, range(start, n_spaces), workers):
+        k, spec = sr["space_index"], sr["spec"]
+        for r, dt in zip(sr["results"], seconds):
             agg = per_validator[r["name"]]
             agg["checks"] += r["checks"]
             total_checks += r["checks"]
+            agg["seconds"] += dt
+            agg["wall_hist"][bisect_right(WALL_EDGES, dt)] += 1
+            agg["checks_hist"][bisect_right(CHECK_EDGES, r["checks"])] += 1
             if r["passed"]:
                 agg["passed"] += 1
             else:
                 agg["failed"] += 1
                 all_passed = False
                 for f in r["failures"]:
-                    agg["failures"].append({"space_index": k, "spec": spec,
-                                            "failure": f})
-        space_reports.append({"space_index": k, "spec": spec,
-                              "results": results})
+                    if len(agg["failures"]) < SAMPLE_FAILURES:
+                        agg["failures"].append({"space_index": k,
+                                                "spec": spec,
+                                                "failure": f})
+        sink.add(sr)
+        if checkpoint and (k + 1) % checkpoint_every == 0:
+            state = {"args": args, "done": k + 1,
+                     "per_validator": per_validator,
+                     "total_checks": total_checks,
+                     "all_passed": all_passed,
+                     "elapsed": elapsed_before + time.time() - t0}
+            save_checkpoint(checkpoint, sink.mark(state))
 
-    elapsed = time.time() - t0
+    elapsed = elapsed_before + time.time() - t0
 
     summary = {}
     for name, agg in per_validator.items():
@@ -89,8 +170,23 @@ def run(seed: int, n_spaces: int, out_path: str) -> int:
             "spaces_failed": agg["failed"],
             "total_checks": agg["checks"],
             "passed": agg["failed"] == 0,
-            "sample_failures": agg["failures"][:5],
+            "sample_failures": agg["failures"],
         }
+    validator_seconds = sum(agg["seconds"] for agg in per_validator.values())
+    checks_profile = {
+        name: {"checks_hist": {"edges": CHECK_EDGES,
+                               "counts": agg["checks_hist"]}}
+        for name, agg in per_validator.items()
+    }
+    profile = {
+        name: {
+            "wall_seconds": round(agg["seconds"], 4),
+            "share_of_wall": (round(agg["seconds"] / validator_seconds, 4)
+                              if validator_seconds else 0.0),
+            "wall_hist": {"edges": WALL_EDGES, "counts": agg["wall_hist"]},
+        }
+        for name, agg in per_validator.items()
+    }
 
     report = {
         "meta": {
@@ -103,14 +199,19 @@ def run(seed: int, n_spaces: int, out_path: str) -> int:
             "elapsed_seconds": round(elapsed, 4),
             "python": platform.python_version(),
             "platform": platform.platform(),
+            "validator_profile": checks_profile,
         },
         "overall_passed": all_passed,
         "summary_by_theorem": summary,
-        "spaces": space_reports,
     }
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2)
+    sink.finish(report)
+    if profile_path:
+        with open(profile_path, "w", encoding="utf-8") as f:
+            json.dump({"seed": seed, "n_spaces": n_spaces, "workers": workers,
+                       "elapsed_seconds": round(elapsed, 4),
+                       "validator_profile": profile}, f, indent=2)
+    clear_checkpoint(checkpoint)
 
     # console summary
     print(f"Bounded Resolvable Space -- validation suite")
@@ -118,15 +219,19 @@ def run(seed: int, n_spaces: int, out_path: str) -> int:
     print(f"  total checks : {total_checks}")
     print(f"  elapsed      : {elapsed:.3f}s")
     print(f"  seed         : {seed}")
+    print(f"  workers      : {workers}")
     print("-" * 60)
     for name, s in summary.items():
         flag = "PASS" if s["passed"] else "FAIL"
         print(f"  [{flag}] {name:<26} "
               f"spaces {s['spaces_passed']}/{s['spaces_passed']+s['spaces_failed']}"
-              f"  checks={s['total_checks']}")
+              f"  checks={s['total_checks']}"
+              f"  wall={100 * profile[name]['share_of_wall']:.0f}%")
     print("-" * 60)
     print(f"  OVERALL: {'PASS' if all_passed else 'FAIL'}")
     print(f"  report written to {out_path}")
+    if profile_path:
+        print(f"  profile written to {profile_path}")
     return 0 if all_passed else 1
 
 
@@ -135,8 +240,18 @@ def main() -> int:
     ap.add_argument("--seed", type=int, default=20260619)
     ap.add_argument("--spaces", type=int, default=200)
     ap.add_argument("--out", type=str, default="validation_results.json")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="process-pool size for the sweep (1 = serial)")
+    ap.add_argument("--stream", action="store_true",
+                    help="write JSON Lines, one record per space as it completes")
+    ap.add_argument("--checkpoint", type=str, default=None,
+                    help="checkpoint file; resumed from if it exists")
+    ap.add_argument("--checkpoint-every", type=int, default=50)
+    ap.add_argument("--profile", type=str, default=None,
+                    help="write worker count and per-validator wall times here")
     args = ap.parse_args()
-    return run(args.seed, args.spaces, args.out)
+    return run(args.seed, args.spaces, args.out, args.workers, args.stream,
+               args.checkpoint, args.checkpoint_every, args.profile)
 
 
 if __name__ == "__main__":
@@ -11,36 +11,52 @@ Theorem references are to the .tex sections.
 
 from __future__ import annotations
 
-from itertools import combinations
+from functools import cached_property
+from itertools import combinations, islice
 from math import isfinite, log
-from typing import Dict, FrozenSet, List, Tuple
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
 
 import brs
-from brs import (Space, boundary_thickness, complement,
-                 realisable_region_from_cells, separator_atoms,
-                 separator_cells)
+from brs import (GrowingRegion, Space, complement,
+                 realisable_region_from_cells, separator_cells)
 
 
 # ---------------------------------------------------------------------
 #  Helpers: enumerate realisable test regions on a space
 # ---------------------------------------------------------------------
-def sample_regions(sp: Space, max_regions: int = 60) -> List[FrozenSet]:
-    """Realisable regions (proper, non-trivial): unions of cells with both
-    A and complement of positive measure."""
-    n = len(sp.cells)
-    regions: List[FrozenSet] = []
-    # singletons, pairs, and contiguous prefixes -- a spread of sizes
-    idx_sets: List[Tuple[int, ...]] = []
-    idx_sets += [(i,) for i in range(n)]
-    idx_sets += list(combinations(range(n), 2))[: max_regions]
+def region_cell_sets(sp: Space, max_pairs: int = 60) -> Iterator[np.ndarray]:
+    """Candidate realisable regions as boolean masks over cell ids, lazily:
+    singletons, the first `max_pairs` pairs, then contiguous prefixes -- a
+    spread of sizes. May repeat a region and includes the whole."""
+    n = sp.n_cells
+    for i in range(n):
+        sel = np.zeros(n, dtype=bool)
+        sel[i] = True
+        yield sel
+    for i, j in islice(combinations(range(n), 2), max_pairs):
+        sel = np.zeros(n, dtype=bool)
+        sel[[i, j]] = True
+        yield sel
     for k in range(1, n):
-        idx_sets.append(tuple(range(k)))
+        sel = np.zeros(n, dtype=bool)
+        sel[:k] = True
+        yield sel
+
+
+def sample_regions(sp: Space, max_regions: int = 60) -> List[np.ndarray]:
+    """Realisable regions (proper, non-trivial): unions of cells with both
+    A and complement of positive measure, as atom masks."""
+    regions: List[np.ndarray] = []
     seen = set()
-    for ids in idx_sets:
-        A = realisable_region_from_cells(sp, ids)
-        if A in seen:
+    for sel in region_cell_sets(sp, max_regions):
+        # cells are disjoint and non-empty: equal id sets <=> equal regions
+        key = sel.tobytes()
+        if key in seen:
             continue
-        seen.add(A)
+        seen.add(key)
+        A = realisable_region_from_cells(sp, sel)
         if 0 < sp.mu(A) < sp.total_measure:
             regions.append(A)
         if len(regions) >= max_regions:
@@ -48,23 +64,69 @@ def sample_regions(sp: Space, max_regions: int = 60) -> List[FrozenSet]:
     return regions
 
 
+class SpaceAnalysis:
+    """Per-space memo of the geometry the validators share: the sampled
+    regions, connectedness, mu_min, and Sigma_Part / beta of each region
+    (keyed by the region mask's bytes). The runner builds one per space and
+    hands it to every validator. Cached masks and lists are shared -- treat
+    them as read-only."""
+
+    def __init__(self, sp: Space):
+        self.sp = sp
+        self._regions: Dict[int, List[np.ndarray]] = {}
+        self._sep: Dict[bytes, List[int]] = {}
+        self._sep_atoms: Dict[bytes, np.ndarray] = {}
+
+    @cached_property
+    def connected(self) -> bool:
+        return self.sp.is_connected()
+
+    @cached_property
+    def mu_min(self) -> float:
+        return self.sp.mu_min
+
+    def regions(self, max_regions: int = 60) -> List[np.ndarray]:
+        if max_regions not in self._regions:
+            self._regions[max_regions] = sample_regions(self.sp, max_regions)
+        return self._regions[max_regions]
+
+    def separator_cells(self, A: np.ndarray) -> List[int]:
+        key = A.tobytes()
+        if key not in self._sep:
+            self._sep[key] = separator_cells(self.sp, A)
+        return self._sep[key]
+
+    def separator_atoms(self, A: np.ndarray) -> np.ndarray:
+        key = A.tobytes()
+        if key not in self._sep_atoms:
+            self._sep_atoms[key] = realisable_region_from_cells(
+                self.sp, self.separator_cells(A))
+        return self._sep_atoms[key]
+
+    def boundary_thickness(self, A: np.ndarray) -> float:
+        sp = self.sp
+        return sp.weight * int(sp.cell_sizes[self.separator_cells(A)].sum())
+
+
 # ---------------------------------------------------------------------
 #  1. Negation: complement is an involution; identity is selector-free
 #     (Thm: Negation is the unique selector-free individuation)
 # ---------------------------------------------------------------------
-def v_negation(sp: Space) -> Dict:
+def v_negation(sp: Space, ctx: Optional[SpaceAnalysis] = None) -> Dict:
+    ctx = ctx or SpaceAnalysis(sp)
     failures = []
     checks = 0
-    for A in sample_regions(sp):
+    for A in ctx.regions():
         checks += 1
+        N = complement(sp, A)
         # involution: Omega \ (Omega \ A) = A   (uniqueness/sufficiency)
-        if complement(sp, complement(sp, A)) != A:
+        if not np.array_equal(complement(sp, N), A):
             failures.append("double-complement != A")
         # negation needs no selector: N(A) determined by A and whole alone
         # (here: complement is total, partitions Omega with A, no element named)
-        if set(A) | set(complement(sp, A)) != set(sp.atoms):
+        if not np.array_equal(A | N, sp.atom_mask):
             failures.append("A and N(A) do not partition Omega")
-        if set(A) & set(complement(sp, A)):
+        if (A & N).any():
             failures.append("A and N(A) overlap")
     return {
         "name": "negation_uniqueness",
@@ -81,11 +143,13 @@ def v_negation(sp: Space) -> Dict:
 #  2. Non-instantaneity + residue
 #     (Thm: Non-instantaneity)  k=0 yields no part; pre-completion residue>0
 # ---------------------------------------------------------------------
-def v_non_instantaneity(sp: Space) -> Dict:
+def v_non_instantaneity(sp: Space,
+                        ctx: Optional[SpaceAnalysis] = None) -> Dict:
+    ctx = ctx or SpaceAnalysis(sp)
     failures = []
     checks = 0
     # k=0: only datum is A_0 = Omega; complement is empty -> not a region
-    A0 = frozenset(sp.atoms)
+    A0 = sp.atom_mask
     checks += 1
     if sp.mu(complement(sp, A0)) != 0.0:
         failures.append("Omega complement nonempty (model error)")
@@ -95,13 +159,13 @@ def v_non_instantaneity(sp: Space) -> Dict:
 
     # pre-completion residue: any proper realisable region in a connected
     # space has a non-empty separator of measure >= mu_min (the floor).
-    if sp.is_connected():
-        for A in sample_regions(sp):
+    if ctx.connected:
+        for A in ctx.regions():
             checks += 1
-            sep = separator_atoms(sp, A)
+            sep = ctx.separator_atoms(A)
             if sp.mu(sep) <= 0:
                 failures.append("empty separator before completion")
-            if sp.mu(sep) < sp.mu_min - 1e-12:
+            if sp.mu(sep) < ctx.mu_min - 1e-12:
                 failures.append("residue below floor mu_min")
     return {
         "name": "non_instantaneity_residue",
@@ -111,19 +175,21 @@ def v_non_instantaneity(sp: Space) -> Dict:
         "passed": not failures,
         "checks": checks,
         "failures": failures[:10],
-        "evidence": {"mu_min": sp.mu_min, "connected": sp.is_connected()},
+        "evidence": {"mu_min": ctx.mu_min, "connected": ctx.connected},
     }
 
 
 # ---------------------------------------------------------------------
 #  3. Boundary-Thickness Theorem:  beta_Part(A) >= mu_min > 0
 # ---------------------------------------------------------------------
-def v_boundary_thickness(sp: Space) -> Dict:
+def v_boundary_thickness(sp: Space,
+                         ctx: Optional[SpaceAnalysis] = None) -> Dict:
+    ctx = ctx or SpaceAnalysis(sp)
     failures = []
     checks = 0
     sharp = 0  # count of zero-measure separators (must be 0)
     min_seen = None
-    if not sp.is_connected():
+    if not ctx.connected:
         # theorem assumes connectedness; skip gracefully
         return {
             "name": "boundary_thickness",
@@ -132,15 +198,15 @@ def v_boundary_thickness(sp: Space) -> Dict:
             "passed": True, "checks": 0, "failures": [],
             "evidence": {"skipped": "space disconnected"},
         }
-    for A in sample_regions(sp):
+    for A in ctx.regions():
         checks += 1
-        t = boundary_thickness(sp, A)
+        t = ctx.boundary_thickness(A)
         min_seen = t if min_seen is None else min(min_seen, t)
         if t == 0.0:
             sharp += 1
             failures.append("sharp (zero-measure) separator realised")
-        if t < sp.mu_min - 1e-12:
-            failures.append(f"thickness {t} < mu_min {sp.mu_min}")
+        if t < ctx.mu_min - 1e-12:
+            failures.append(f"thickness {t} < mu_min {ctx.mu_min}")
     return {
         "name": "boundary_thickness",
         "claim": "beta_Part(A) >= mu_min > 0 for every realisable region; "
@@ -148,7 +214,7 @@ def v_boundary_thickness(sp: Space) -> Dict:
         "passed": not failures,
         "checks": checks,
         "failures": failures[:10],
-        "evidence": {"mu_min": sp.mu_min, "min_thickness_seen": min_seen,
+        "evidence": {"mu_min": ctx.mu_min, "min_thickness_seen": min_seen,
                      "sharp_separators": sharp},
     }
 
@@ -162,18 +228,19 @@ def _cost_g(m: float) -> float:
     return -log(m) if m > 0 else float("inf")
 
 
-def v_floor_agreement(sp: Space) -> Dict:
+def v_floor_agreement(sp: Space, ctx: Optional[SpaceAnalysis] = None) -> Dict:
+    ctx = ctx or SpaceAnalysis(sp)
     failures = []
     checks = 0
-    if not sp.is_connected():
+    if not ctx.connected:
         return {"name": "floor_agreement",
                 "claim": "geometric, representational, cost floors all >= mu_min.",
                 "passed": True, "checks": 0, "failures": [],
                 "evidence": {"skipped": "space disconnected"}}
 
-    regions = sample_regions(sp)
+    regions = ctx.regions()
     # geometric floor = inf over regions of boundary thickness
-    geo_floor = min(boundary_thickness(sp, A) for A in regions)
+    geo_floor = min(ctx.boundary_thickness(A) for A in regions)
 
     # representational residue (Prop: representational residue):
     # for a NON-realisable target (a sub-cell set), the named realisable
@@ -184,29 +251,31 @@ def v_floor_agreement(sp: Space) -> Dict:
     # We therefore measure the separator cells the discrepancy touches.
     rep_residues = []
     for A in regions:
-        sep = separator_cells(sp, A)
+        sep = ctx.separator_cells(A)
         if not sep:
             continue
-        c = sp.cells[sep[0]]
+        c = sp.cell_sites[sep[0]]
         # target sneaks half a separator cell in -> non-realisable
-        half = frozenset(list(c)[: max(1, len(c) // 2)])
-        target = frozenset(set(A) | set(half))
+        target = A.copy()
+        target.flat[c[: max(1, len(c) // 2)]] = True
         # named approximant = union of cells fully inside target
-        named_cells = [i for i, cc in enumerate(sp.cells) if set(cc) <= set(target)]
+        named_cells = np.flatnonzero(
+            np.bincount(sp.labels[target], minlength=sp.n_cells)
+            == sp.cell_sizes)
         named = realisable_region_from_cells(sp, named_cells)
-        disc = frozenset(set(target) ^ set(named))
-        if not disc:
+        disc = target ^ named
+        if not disc.any():
             continue
         # the residue is the measure of the whole cells the discrepancy lies in
-        touched = {sp.cell_of(a) for a in disc}
+        touched = np.unique(sp.labels[disc])
         residue = sp.mu(realisable_region_from_cells(sp, touched))
         rep_residues.append(residue)
     rep_floor = min(rep_residues) if rep_residues else geo_floor
 
     # cost floor: largest t with g(t) <= C ; separating cells forced >= mu_min
-    C = _cost_g(sp.mu_min) + 1e-9  # budget that just affords mu_min cells
+    C = _cost_g(ctx.mu_min) + 1e-9  # budget that just affords mu_min cells
     # t_* = sup{t : g(t) <= C}; with g=-log, g(t)<=C  <=>  t >= e^{-C}=mu_min
-    cost_floor = sp.mu_min
+    cost_floor = ctx.mu_min
 
     checks += 1
     # all three strictly positive
@@ -215,8 +284,8 @@ def v_floor_agreement(sp: Space) -> Dict:
             failures.append(f"{nm} floor not positive: {val}")
     # all three bound the same constant: each >= mu_min (within tolerance)
     for nm, val in (("geo", geo_floor), ("rep", rep_floor), ("cost", cost_floor)):
-        if val < sp.mu_min - 1e-9:
-            failures.append(f"{nm} floor {val} < mu_min {sp.mu_min}")
+        if val < ctx.mu_min - 1e-9:
+            failures.append(f"{nm} floor {val} < mu_min {ctx.mu_min}")
     # cost divergence sanity: g(t) -> inf as t -> 0
     if not (_cost_g(1e-9) > _cost_g(1e-3) > _cost_g(1.0)):
         failures.append("cost g not monotone-divergent toward 0")
@@ -230,7 +299,7 @@ def v_floor_agreement(sp: Space) -> Dict:
         "checks": checks,
         "failures": failures[:10],
         "evidence": {"geo_floor": geo_floor, "rep_floor": rep_floor,
-                     "cost_floor": cost_floor, "mu_min": sp.mu_min},
+                     "cost_floor": cost_floor, "mu_min": ctx.mu_min},
     }
 
 
@@ -238,21 +307,22 @@ def v_floor_agreement(sp: Space) -> Dict:
 #  5. Detectability iff sigma(A) > beta(A); sorites no decisive grain
 #     (Thm: Detectability; Cor: sorites)
 # ---------------------------------------------------------------------
-def v_detectability(sp: Space) -> Dict:
+def v_detectability(sp: Space, ctx: Optional[SpaceAnalysis] = None) -> Dict:
+    ctx = ctx or SpaceAnalysis(sp)
     failures = []
     checks = 0
-    if not sp.is_connected():
+    if not ctx.connected:
         return {"name": "detectability_sorites",
                 "claim": "A distinguishable iff sigma(A) > beta(A); sorites "
                          "has no decisive grain.",
                 "passed": True, "checks": 0, "failures": [],
                 "evidence": {"skipped": "space disconnected"}}
 
-    for A in sample_regions(sp):
+    for A in ctx.regions():
         checks += 1
         sigma = sp.mu(A)
-        sep_atoms = separator_atoms(sp, A)
-        interior = sp.mu(frozenset(set(A) - set(sep_atoms)))
+        sep_atoms = ctx.separator_atoms(A)
+        interior = sp.mu(A & ~sep_atoms)
         distinguishable = interior > 1e-12
         # Detectability Theorem (faithful form): the relevant comparison is
         # sigma(A) vs the measure of A's OWN share of the separator, i.e.
@@ -261,14 +331,14 @@ def v_detectability(sp: Space) -> Dict:
         # is NOT the quantity the equivalence is stated with.  By the cell
         # decomposition  sigma = mu(A\Sigma) + mu(A cap Sigma) = interior + beta_A,
         # so  interior > 0  <=>  sigma > beta_A  exactly.
-        beta_A = sp.mu(frozenset(set(A) & set(sep_atoms)))
+        beta_A = sp.mu(A & sep_atoms)
         predicted = sigma > beta_A + 1e-12
         if distinguishable != predicted:
             failures.append(f"detectability mismatch sigma={sigma} "
                             f"beta_A={beta_A} interior={interior}")
         # sub-floor region must be engulfed (not distinguishable): if every
         # cell of A also borders the complement, A has no interior.
-        if sigma <= sp.mu_min + 1e-12:
+        if sigma <= ctx.mu_min + 1e-12:
             if interior > 1e-12:
                 failures.append("sub-floor region distinguishable "
                                 "(should be engulfed)")
@@ -295,32 +365,30 @@ def v_detectability(sp: Space) -> Dict:
     #       domain), i.e. never via a single grain whose theta exceeds the
     #       aggregate it joins.
     sorites_ok = True
-    order = sorted(sp.atoms)
-    grown = set()
+    order = sp.atom_sites.tolist()  # row-major == sorted coordinates
+    grown = GrowingRegion(sp)
     prev_tau = None
     prev_sigma = 0.0
     crossings = 0
     grain_measure = sp.weight  # one atom
-    sub_floor_grain = grain_measure <= sp.mu_min + 1e-12
+    sub_floor_grain = grain_measure <= ctx.mu_min + 1e-12
     for a in order:
-        grown.add(a)
-        A = frozenset(grown)
-        if not (0 < sp.mu(A) < sp.total_measure):
+        grown.add_site(a)
+        sigma = grown.sigma
+        if not (0 < sigma < sp.total_measure):
             continue
-        beta = boundary_thickness(sp, A)
-        sigma = sp.mu(A)
-        tau = beta / sigma if sigma else float("inf")
+        tau = grown.tau
         if prev_tau is not None and (prev_tau >= 1) != (tau >= 1):
             crossings += 1
             # a crossing is effected by a *decisive grain* only if that single
             # grain's contribution exceeds the floor (theta > mu_min) AND it
             # alone dominated the aggregate it joined (theta > prev_sigma).
-            decisive = (grain_measure > sp.mu_min + 1e-12
+            decisive = (grain_measure > ctx.mu_min + 1e-12
                         and grain_measure > prev_sigma + 1e-12)
             if decisive:
                 failures.append(
                     f"decisive grain at crossing tau {prev_tau:.3f}->{tau:.3f}: "
-                    f"grain={grain_measure} > mu_min={sp.mu_min} and "
+                    f"grain={grain_measure} > mu_min={ctx.mu_min} and "
                     f"> prev_sigma={prev_sigma}")
                 sorites_ok = False
         prev_tau = tau
@@ -342,7 +410,7 @@ def v_detectability(sp: Space) -> Dict:
         "failures": failures[:10],
         "evidence": {"sorites_tau_crossings": crossings,
                      "grain_measure": grain_measure,
-                     "sub_floor_grain": grain_measure <= sp.mu_min + 1e-12,
+                     "sub_floor_grain": grain_measure <= ctx.mu_min + 1e-12,
                      "sorites_no_decisive_grain": sorites_ok},
     }
 
@@ -351,7 +419,7 @@ def v_detectability(sp: Space) -> Dict:
 #  6. Diagonal obstruction + residue not exhibitable
 #     (Thm: Diagonal obstruction; Thm: residue not exhibitable)
 # ---------------------------------------------------------------------
-def v_diagonal(sp: Space) -> Dict:
+def v_diagonal(sp: Space, ctx: Optional[SpaceAnalysis] = None) -> Dict:
     """We instantiate the diagonal argument concretely. A 'self-applicable
     verifier' is any total function V: parts -> {0,1} that also accepts the
     code of a part defined in terms of V itself. We show no such V can be
@@ -399,7 +467,8 @@ def v_diagonal(sp: Space) -> Dict:
 #  7. Non-return monotone record + cessation
 #     (Thm: Non-return; Thm: Inquiry cessation)
 # ---------------------------------------------------------------------
-def v_non_return(sp: Space) -> Dict:
+def v_non_return(sp: Space, ctx: Optional[SpaceAnalysis] = None) -> Dict:
+    ctx = ctx or SpaceAnalysis(sp)
     failures = []
     checks = 0
 
@@ -410,8 +479,8 @@ def v_non_return(sp: Space) -> Dict:
     M = 0
     record_history = []
     # forward commits
-    for A in sample_regions(sp):
-        committed = len(separator_cells(sp, A))
+    for A in ctx.regions():
+        committed = len(ctx.separator_cells(A))
         M += committed  # each step adds its committed separator cells
         record_history.append(M)
     # attempt an "undo": it is itself a recorded act -> M strictly grows
@@ -15,77 +15,34 @@ Claims tested:
   (V2c) Non-locality: on the two-triangle witness the minimiser is a
         two-block partition, and NO singleton split attains chi.
 
-Independence of the test: chi is computed by brute-force enumeration of all
-set-partitions with >=2 blocks; invariance is checked by relabelling the
-vertex set with random permutations and recomputing chi from scratch. The
+Independence of the test: chi is computed exactly over all set-partitions
+with >=2 blocks -- a global min cut bounds a branch-and-bound search that
+returns the same minimiser as enumerating every partition (kept as
+character_invariant(W, brute_force=True)); invariance is checked by
+relabelling the vertex set with random permutations and recomputing chi from
+scratch. The
 relabelled graph is a genuinely different adjacency structure, so equality of
 the recomputed minima is a real test, not an identity.
 """
-import json, itertools, os
+import json, os
 import numpy as np
 
+from graph_kernels import (character_invariant, cut_weight, gray_code_cuts,
+                           relabel)
+
 RNG = np.random.default_rng(42)
 HERE = os.path.dirname(os.path.abspath(__file__))
 RESULTS = os.path.join(HERE, "results")
 
 
-def all_partitions(elements):
-    """Yield all set-partitions of `elements` (list) as list-of-blocks."""
-    if len(elements) == 1:
-        yield [elements]
-        return
-    first = elements[0]
-    for smaller in all_partitions(elements[1:]):
-        for i, block in enumerate(smaller):
-            yield smaller[:i] + [[first] + block] + smaller[i + 1:]
-        yield [[first]] + smaller
-
-
-def cut_weight(W, S, T):
-    return sum(W[u][v] for u in S for v in T if W[u][v] > 0)
-
-
-def internal_residual(W, partition):
-    r = 0.0
-    for i in range(len(partition)):
-        for j in range(i + 1, len(partition)):
-            r += cut_weight(W, partition[i], partition[j])
-    return r
-
-
-def character_invariant(W):
-    """chi = min over partitions with >=2 blocks of internal residual.
-    Returns (chi, minimising_partition, minimiser_is_singleton_split)."""
-    n = len(W)
-    verts = list(range(n))
-    best, best_part = np.inf, None
-    for part in all_partitions(verts):
-        if len(part) < 2:
-            continue
-        r = internal_residual(W, part)
-        if r < best - 1e-12:
-            best, best_part = r, part
-    # is the minimiser a "singleton split" (isolating exactly one vertex)?
-    is_singleton = any(len(b) == 1 for b in best_part) and len(best_part) == 2 \
-        and (min(len(b) for b in best_part) == 1)
-    # stricter: a singleton split means one block has size 1 and the other n-1
-    sizes = sorted(len(b) for b in best_part)
-    is_singleton_split = (len(best_part) == 2 and sizes[0] == 1)
-    return best, best_part, is_singleton_split
-
-
 def realised_floor(W):
     """min over nonempty proper subsets U of boundary cost b(U)."""
-    n = len(W)
-    verts = list(range(n))
-    best = np.inf
-    for k in range(1, n):
-        for U in itertools.combinations(verts, k):
-            Uset = set(U)
-            comp = [v for v in verts if v not in Uset]
-            b = cut_weight(W, list(U), comp)
-            best = min(best, b)
-    return best
+    best, best_S = np.inf, None
+    for in_S, b in gray_code_cuts(W):
+        if b < best:
+            best, best_S = b, in_S.copy()
+    # report the exact cut of the minimiser, not the running Gray-code sum
+    return cut_weight(W, np.flatnonzero(best_S), np.flatnonzero(~best_S))
 
 
 def random_connected_weighted_graph(n, floor, density, weight_spread):
@@ -105,15 +62,6 @@ def random_connected_weighted_graph(n, floor, density, weight_spread):
     return W
 
 
-def relabel(W, perm):
-    n = len(W)
-    W2 = np.zeros((n, n))
-    for i in range(n):
-        for j in range(n):
-            W2[perm[i]][perm[j]] = W[i][j]
-    return W2
-
-
 def two_triangle_witness():
     # vertices 0,1,2 triangle (edge 2), 3,4,5 triangle (edge 2), join 2-3 (edge 2)
     n = 6
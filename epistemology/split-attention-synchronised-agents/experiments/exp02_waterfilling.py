@@ -15,70 +15,20 @@ gamma_i(0)=0. Then gamma_i'(a) = k_i s_i / (1 + s_i a), and the inverse
 
 Independence: the water-filling result is checked against scipy's general-
 purpose constrained maximiser, which knows nothing of the water-filling
-structure. Agreement is a genuine cross-method test.
+structure. Agreement is a genuine cross-method test. The V3c/V4 sweeps use
+the exact sorted-breakpoint solver (waterfill.py), all budgets in one call.
 """
 import json, os
 import numpy as np
-from scipy.optimize import minimize
+
+from waterfill import (gamma_prime, waterfill, waterfill_bisection,
+                       waterfill_scipy)
 
 RNG = np.random.default_rng(42)
 HERE = os.path.dirname(os.path.abspath(__file__))
 RESULTS = os.path.join(HERE, "results")
 
 
-def gamma(a, k, s):
-    return k * np.log1p(s * a)
-
-
-def gamma_prime(a, k, s):
-    return k * s / (1.0 + s * a)
-
-
-def gamma_prime_inv(p, k, s):
-    # solve k s /(1+ s a) = p  ->  a = (k s / p - 1)/s ; clip at 0
-    if p <= 0:
-        return np.inf
-    a = (k * s / p - 1.0) / s
-    return max(a, 0.0)
-
-
-def waterfill_bisection(ks, ss, alpha, eps=1e-12, iters=200):
-    """Paper's Algorithm: bisection on price p*."""
-    p_lo, p_hi = 0.0, max(k * s for k, s in zip(ks, ss))  # max gamma'(0)
-    for _ in range(iters):
-        if p_hi - p_lo <= eps:
-            break
-        p = 0.5 * (p_lo + p_hi)
-        a = [gamma_prime_inv(p, k, s) for k, s in zip(ks, ss)]
-        total = sum(a)
-        if total > alpha:      # price too low -> too much demand
-            p_lo = p
-        else:
-            p_hi = p
-    p = 0.5 * (p_lo + p_hi)
-    a = np.array([gamma_prime_inv(p, k, s) for k, s in zip(ks, ss)])
-    return a, p
-
-
-def waterfill_scipy(ks, ss, alpha):
-    """Independent convex solve: maximise sum gamma_i(a_i) s.t. sum a<=alpha, a>=0."""
-    n = len(ks)
-
-    def neg_obj(a):
-        return -sum(gamma(a[i], ks[i], ss[i]) for i in range(n))
-
-    def neg_grad(a):
-        return -np.array([gamma_prime(a[i], ks[i], ss[i]) for i in range(n)])
-
-    cons = [{"type": "ineq", "fun": lambda a: alpha - np.sum(a)}]
-    bounds = [(0.0, alpha) for _ in range(n)]
-    x0 = np.full(n, alpha / n)
-    res = minimize(neg_obj, x0, jac=neg_grad, bounds=bounds,
-                   constraints=cons, method="SLSQP",
-                   options={"ftol": 1e-12, "maxiter": 500})
-    return res.x
-
-
 def main():
     out = {"experiment": "EXP02_waterfilling", "seed": 42, "cases": []}
     max_alloc_dev = 0.0
@@ -100,8 +50,7 @@ def main():
         # marginal-gain equalisation on the support
         active = a_bis > 1e-9
         if active.sum() >= 1:
-            margins = np.array([gamma_prime(a_bis[i], ks[i], ss[i])
-                                for i in range(n) if active[i]])
+            margins = gamma_prime(a_bis[active], ks[active], ss[active])
             spread = float(margins.max() - margins.min()) if len(margins) > 1 else 0.0
             max_margin_spread = max(max_margin_spread, spread)
 
@@ -116,10 +65,8 @@ def main():
     # ---- V3c monotonicity of p* in budget ----
     ks = np.array([1.0, 2.0, 1.5, 0.8])
     ss = np.array([1.0, 2.0, 0.5, 3.0])
-    prices_budget = []
-    for alpha in np.linspace(0.2, 5.0, 25):
-        _, p = waterfill_bisection(ks, ss, alpha)
-        prices_budget.append(p)
+    _, prices = waterfill(ks, ss, np.linspace(0.2, 5.0, 25))
+    prices_budget = prices.tolist()
     for i in range(1, len(prices_budget)):
         if prices_budget[i] > prices_budget[i - 1] + 1e-9:
             monotone_budget_ok = False
@@ -131,7 +78,7 @@ def main():
     for m in range(1, 9):
         base_k.append(float(RNG.uniform(0.5, 3.0)))
         base_s.append(float(RNG.uniform(0.5, 4.0)))
-        _, p = waterfill_bisection(base_k, base_s, alpha_fixed)
+        _, p = waterfill(base_k, base_s, alpha_fixed)
         prices_scenes.append(p)
     for i in range(1, len(prices_scenes)):
         if prices_scenes[i] < prices_scenes[i - 1] - 1e-9:
@@ -150,7 +97,7 @@ def main():
     p_rich = gamma_prime(alpha2, k1, s1)          # gamma1'(alpha) if scene1 took all
     token_allocs, entry_margins = [], []
     for k2 in np.linspace(3.0, p_rich * 1.0005 / s2, 15):
-        a, p = waterfill_bisection([k1, float(k2)], [s1, s2], alpha2)
+        a, p = waterfill([k1, float(k2)], [s1, s2], alpha2)
         token_allocs.append(float(a[1]))
         entry_margins.append(float(k2 * s2))
     # monotone shrink toward 0 as entry margin falls toward the price
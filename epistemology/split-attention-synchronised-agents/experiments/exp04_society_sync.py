@@ -20,43 +20,16 @@ Claims tested:
 """
 import json, os
 import numpy as np
-from scipy.optimize import minimize
+
+from graph_kernels import character_invariant
+from waterfill import waterfill_bisection, waterfill_scipy
 
 RNG = np.random.default_rng(42)
 HERE = os.path.dirname(os.path.abspath(__file__))
 RESULTS = os.path.join(HERE, "results")
 
 
-# ---------- society identity (reuse brute-force chi) ----------
-def all_partitions(elements):
-    if len(elements) == 1:
-        yield [elements]; return
-    first = elements[0]
-    for smaller in all_partitions(elements[1:]):
-        for i, block in enumerate(smaller):
-            yield smaller[:i] + [[first] + block] + smaller[i + 1:]
-        yield [[first]] + smaller
-
-
-def cut_weight(W, S, T):
-    return sum(W[u][v] for u in S for v in T if W[u][v] > 0)
-
-
-def character_invariant(W):
-    n = len(W); verts = list(range(n))
-    best, best_part = np.inf, None
-    for part in all_partitions(verts):
-        if len(part) < 2:
-            continue
-        r = sum(cut_weight(W, part[i], part[j])
-                for i in range(len(part)) for j in range(i + 1, len(part)))
-        if r < best - 1e-12:
-            best, best_part = r, part
-    sizes = sorted(len(b) for b in best_part)
-    is_singleton_split = (len(best_part) == 2 and sizes[0] == 1)
-    return best, best_part, is_singleton_split
-
-
+# ---------- society identity (exact chi, shared with EXP01) ----------
 def society_two_blocks():
     # 2 agent-blocks of 3 agents each (triangles, weight 2), joined by one edge 2
     n = 6
@@ -147,34 +120,6 @@ def crowd_sharpening():
     return rows, max_err, monotone
 
 
-# ---------- society-level water-filling (self-similarity) ----------
-def gamma(a, k, s): return k * np.log1p(s * a)
-def gamma_prime_inv(p, k, s): return max((k * s / p - 1.0) / s, 0.0) if p > 0 else np.inf
-
-
-def waterfill_bisection(ks, ss, alpha, eps=1e-12):
-    p_lo, p_hi = 0.0, max(k * s for k, s in zip(ks, ss))
-    for _ in range(200):
-        if p_hi - p_lo <= eps: break
-        p = 0.5 * (p_lo + p_hi)
-        if sum(gamma_prime_inv(p, k, s) for k, s in zip(ks, ss)) > alpha:
-            p_lo = p
-        else:
-            p_hi = p
-    p = 0.5 * (p_lo + p_hi)
-    return np.array([gamma_prime_inv(p, k, s) for k, s in zip(ks, ss)]), p
-
-
-def waterfill_scipy(ks, ss, alpha):
-    n = len(ks)
-    negobj = lambda a: -sum(gamma(a[i], ks[i], ss[i]) for i in range(n))
-    cons = [{"type": "ineq", "fun": lambda a: alpha - np.sum(a)}]
-    res = minimize(negobj, np.full(n, alpha / n),
-                   bounds=[(0, alpha)] * n, constraints=cons,
-                   method="SLSQP", options={"ftol": 1e-12, "maxiter": 500})
-    return res.x
-
-
 def main():
     out = {"experiment": "EXP04_society_sync", "seed": 42}
 
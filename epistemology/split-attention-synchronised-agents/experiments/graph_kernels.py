@@ -0,0 +1,175 @@
+"""
+Shared NumPy kernels for the self-graph experiments (EXP01, EXP04).
+
+  relabel              W permuted by a vertex relabelling, W[np.ix_(inv, inv)]
+  cut_weight           weight between two vertex lists by block indexing
+  internal_residual    total weight between the blocks of a partition
+  gray_code_cuts       every 2-block cut in Gray-code order, O(n) per step
+  character_invariant  chi = min residual over >=2-block partitions, exact
+                       (global min cut + branch-and-bound; brute force kept)
+"""
+import numpy as np
+
+
+def relabel(W, perm):
+    """The graph with vertex i renamed perm[i]: W2[perm[i], perm[j]] = W[i, j]."""
+    inv = np.argsort(perm)
+    return np.asarray(W)[np.ix_(inv, inv)]
+
+
+def all_partitions(elements):
+    """Yield all set-partitions of `elements` (list) as list-of-blocks."""
+    if len(elements) == 1:
+        yield [elements]
+        return
+    first = elements[0]
+    for smaller in all_partitions(elements[1:]):
+        for i, block in enumerate(smaller):
+            yield smaller[:i] + [[first] + block] + smaller[i + 1:]
+        yield [[first]] + smaller
+
+
+def cut_weight(W, S, T):
+    """Total positive weight between vertex lists S and T (block indexing)."""
+    B = np.asarray(W)[np.ix_(S, T)]
+    return float(B[B > 0].sum())
+
+
+def internal_residual(W, partition):
+    r = 0.0
+    for i in range(len(partition)):
+        for j in range(i + 1, len(partition)):
+            r += cut_weight(W, partition[i], partition[j])
+    return r
+
+
+def global_min_cut(W):
+    """Stoer-Wagner: weight of a minimum cut of W into two nonempty blocks."""
+    W = np.array(W, dtype=float)
+    n = len(W)
+    active = np.ones(n, dtype=bool)
+    best = np.inf
+    for _ in range(n - 1):
+        # maximum-adjacency order over the active (merged) vertices
+        added = ~active
+        s = int(np.argmax(active))
+        added[s] = True
+        conn = W[s].copy()
+        prev, last = s, s
+        while not added.all():
+            t = int(np.argmax(np.where(added, -np.inf, conn)))
+            cut_of_phase = conn[t]
+            added[t] = True
+            conn += W[t]
+            prev, last = last, t
+        best = min(best, cut_of_phase)
+        # merge the last two vertices of the phase
+        W[prev] += W[last]
+        W[:, prev] += W[:, last]
+        W[prev, prev] = 0.0
+        W[last] = 0.0
+        W[:, last] = 0.0
+        active[last] = False
+    return best
+
+
+def first_partition_within(W, bound, tol=1e-12):
+    """First >=2-block partition, in all_partitions order, whose internal
+    residual is <= bound + tol (None if there is none).
+
+    Branch-and-bound over block assignments in the generator's own order:
+    the last vertex seeds the first block, and each earlier vertex joins
+    block 0, 1, ... or opens a new block in front. Weights are non-negative,
+    so the residual of a partial assignment only grows, and each unplaced
+    vertex u will still add at least w(u, placed) - max_b w(u, block b);
+    branches whose partial residual plus that bound exceeds bound + tol are
+    cut. Affinities are carried incrementally down the search.
+    """
+    n = len(W)
+
+    def place(x, blocks, aff, w_placed, partial):
+        # blocks: list of vertex lists; aff[b, u] = w(u, blocks[b])
+        if x < 0:
+            return blocks if len(blocks) >= 2 else None
+        w_next = w_placed + W[x]
+        for i in range(len(blocks) + 1):
+            if i < len(blocks):
+                r = partial + w_placed[x] - aff[i, x]
+                nb = blocks[:i] + [[x] + blocks[i]] + blocks[i + 1:]
+                na = aff.copy()
+                na[i] += W[x]
+            else:
+                r = partial + w_placed[x]
+                nb = [[x]] + blocks
+                na = np.vstack([W[x], aff])
+            lb = r + float(np.sum(w_next[:x] - na[:, :x].max(axis=0)))
+            if lb <= bound + tol:
+                found = place(x - 1, nb, na, w_next, r)
+                if found is not None:
+                    return found
+        return None
+
+    return place(n - 2, [[n - 1]], W[n - 1][None, :].copy(),
+                 W[n - 1].copy(), 0.0)
+
+
+def character_invariant(W, brute_force=False):
+    """chi = min over partitions with >=2 blocks of internal residual.
+    Returns (chi, minimising_partition, minimiser_is_singleton_split).
+
+    Merging two blocks never raises the residual, so chi is the global min
+    cut; the minimiser is then the first partition of all_partitions order
+    attaining it (ties within 1e-12, as in the enumeration), found by
+    first_partition_within. brute_force=True enumerates every partition.
+
+    cut_weight counts only positive couplings, so W is clipped to
+    non-negative once here and both paths see the same weights.
+    """
+    W = np.maximum(np.asarray(W, dtype=float), 0.0)
+    if brute_force:
+        return _character_invariant_brute_force(W)
+    best_part = first_partition_within(W, global_min_cut(W))
+    best = internal_residual(W, best_part)
+    sizes = sorted(len(b) for b in best_part)
+    is_singleton_split = (len(best_part) == 2 and sizes[0] == 1)
+    return best, best_part, is_singleton_split
+
+
+def _character_invariant_brute_force(W):
+    n = len(W)
+    verts = list(range(n))
+    best, best_part = np.inf, None
+    for part in all_partitions(verts):
+        if len(part) < 2:
+            continue
+        r = internal_residual(W, part)
+        if r < best - 1e-12:
+            best, best_part = r, part
+    # is the minimiser a "singleton split" (isolating exactly one vertex)?
+    is_singleton = any(len(b) == 1 for b in best_part) and len(best_part) == 2 \
+        and (min(len(b) for b in best_part) == 1)
+    # stricter: a singleton split means one block has size 1 and the other n-1
+    sizes = sorted(len(b) for b in best_part)
+    is_singleton_split = (len(best_part) == 2 and sizes[0] == 1)
+    return best, best_part, is_singleton_split
+
+
+def gray_code_cuts(W):
+    """Yield (in_S, cut) for every nonempty S within {0, ..., n-2} in
+    Gray-code order; S never holds vertex n-1, so each 2-block cut of the
+    graph appears exactly once. in_S is a live boolean mask (copy it to keep
+    it). Each step flips one vertex v, and the cut moves by
+    sign_v * sum_u W[v, u] sign_u with sign = +1 in S, -1 outside: O(n).
+    """
+    Wp = np.where(np.asarray(W) > 0, W, 0.0)
+    np.fill_diagonal(Wp, 0.0)
+    n = len(Wp)
+    in_S = np.zeros(n, dtype=bool)
+    sign = -np.ones(n)
+    cut = 0.0
+    for k in range(1, 2 ** (n - 1)):
+        v = (k & -k).bit_length() - 1  # the bit that changes at step k
+        cut += sign[v] * (Wp[v] @ sign)
+        sign[v] = -sign[v]
+        in_S[v] = not in_S[v]
+        yield in_S, cut
@@ -0,0 +1,95 @@
+"""
+Shared NumPy water-filling engine for the attention experiments (EXP02, EXP04).
+
+Gain profiles gamma_i(a) = k_i ln(1 + s_i a); the demand at price p is
+(gamma_i')^{-1}(p) = (k_i s_i / p - 1)/s_i for p < k_i s_i, else 0.
+
+  waterfill            exact price p* by sorted-breakpoint search, O(n log n),
+                       for one budget alpha or a batch of budgets in one call
+  waterfill_bisection  the paper's Algorithm: bisection on p*, vectorised demand
+  waterfill_scipy      independent SLSQP solve with an analytic gradient
+
+The demand is piecewise K/p - S between breakpoints b_i = k_i s_i = gamma_i'(0):
+with the m scenes of largest b_i attended, sum a_i = K_m/p - S_m where
+K_m = sum k_i and S_m = sum 1/s_i over those scenes, so p* = K_m/(alpha + S_m)
+once m is known -- and m is found by one searchsorted over the demand at the
+sorted breakpoints. No bisection tolerance enters.
+"""
+import numpy as np
+from scipy.optimize import minimize
+
+
+def gamma(a, k, s):
+    return k * np.log1p(s * a)
+
+
+def gamma_prime(a, k, s):
+    return k * s / (1.0 + s * a)
+
+
+def gamma_prime_inv(p, k, s):
+    """Demand (gamma')^{-1}(p) clipped at 0, elementwise; inf for p <= 0."""
+    p = np.asarray(p, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.maximum((k * s / p - 1.0) / s, 0.0)
+    return np.where(p > 0, a, np.inf)
+
+
+def waterfill(ks, ss, alpha):
+    """Exact water-filling: (allocation, p*) for budget alpha > 0.
+
+    alpha may be an array of budgets; then the allocation has shape
+    alpha.shape + (n,) and p* has alpha's shape.
+    """
+    ks = np.asarray(ks, dtype=float)
+    ss = np.asarray(ss, dtype=float)
+    alpha = np.asarray(alpha, dtype=float)
+    b = ks * ss                                   # breakpoints gamma_i'(0)
+    order = np.argsort(-b, kind="stable")
+    b_sorted = b[order]
+    K = np.concatenate([[0.0], np.cumsum(ks[order])])
+    S = np.concatenate([[0.0], np.cumsum(1.0 / ss[order])])
+    # demand just as the price falls to breakpoint j (scenes 0..j-1 attended)
+    demand_at_b = K[:-1] / b_sorted - S[:-1]
+    m = np.searchsorted(demand_at_b, alpha, side="left")
+    with np.errstate(divide="ignore", invalid="ignore"):  # m == 0: alpha <= 0
+        p = np.where(m > 0, K[m] / (alpha + S[m]), b_sorted[0])
+    a = gamma_prime_inv(p[..., None], ks, ss)
+    return a, (float(p) if p.ndim == 0 else p)
+
+
+def waterfill_bisection(ks, ss, alpha, eps=1e-12, iters=200):
+    """Paper's Algorithm: bisection on price p*."""
+    ks = np.asarray(ks, dtype=float)
+    ss = np.asarray(ss, dtype=float)
+    p_lo, p_hi = 0.0, float(np.max(ks * ss))      # max gamma'(0)
+    for _ in range(iters):
+        if p_hi - p_lo <= eps:
+            break
+        p = 0.5 * (p_lo + p_hi)
+        if np.sum(gamma_prime_inv(p, ks, ss)) > alpha:  # price too low
+            p_lo = p
+        else:
+            p_hi = p
+    p = 0.5 * (p_lo + p_hi)
+    return gamma_prime_inv(p, ks, ss), p
+
+
+def waterfill_scipy(ks, ss, alpha):
+    """Independent convex solve: maximise sum gamma_i(a_i) s.t. sum a<=alpha, a>=0."""
+    ks = np.asarray(ks, dtype=float)
+    ss = np.asarray(ss, dtype=float)
+    n = len(ks)
+
+    def neg_obj(a):
+        return -np.sum(gamma(a, ks, ss))
+
+    def neg_grad(a):
+        return -gamma_prime(a, ks, ss)
+
+    cons = [{"type": "ineq", "fun": lambda a: alpha - np.sum(a),
+             "jac": lambda a: -np.ones(n)}]
+    res = minimize(neg_obj, np.full(n, alpha / n), jac=neg_grad,
+                   bounds=[(0.0, alpha)] * n, constraints=cons,
+                   method="SLSQP", options={"ftol": 1e-12, "maxiter": 500})
+    return res.x
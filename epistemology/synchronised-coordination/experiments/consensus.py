@@ -0,0 +1,110 @@
+"""
+Vectorised consensus statistics for a panel of agents (EXT08/09).
+
+P is an (n_agents, n_samples) array of predicted labels, one row per agent.
+
+  label_codes          the label set and per-entry label codes used below
+  vote_counts          (sample, label, count) for every pair that occurs
+  majority_vote        plurality label per sample; ties go to the smallest
+                       label (the same choice as np.unique + argmax per column)
+  pairwise_agreement   (n_agents, n_agents) fraction of samples on which two
+                       agents give the same label
+  error_correlation    (n_agents, n_agents) Pearson correlation of the
+                       agents' wrong-answer indicators
+
+Votes are counted over the (sample, label) cells that actually occur: one
+bincount when the label set is no larger than the panel (or a small
+constant), otherwise one sort of the cell keys. Agreement is
+sum_c [P_a == c][P_b == c] -- one (n_agents x n_samples) product per label
+for small label sets, or a single sparse one-hot product otherwise -- and
+the error correlation is one product of the centred indicator matrix with
+its transpose. No Python loop runs over agents, agent pairs or samples, and
+memory stays O(n_agents * n_samples + n_agents^2) however many labels occur.
+"""
+import numpy as np
+from scipy import sparse
+
+# float32 sums of 0/1 products are exact up to 2**24; chunk samples below it
+_EXACT_F32 = 1 << 24
+# label sets up to this size (or up to n_agents) are handled densely
+_DENSE_LABELS = 32
+
+
+def _dense_limit(n_agents):
+    return max(_DENSE_LABELS, n_agents)
+
+
+def label_codes(P):
+    """(labels, code) with labels[code] == P. Non-negative integer labels
+    below the dense limit are used as their own codes (no sort); anything
+    else goes through np.unique. Unused codes only add empty label slots."""
+    P = np.asarray(P)
+    if (np.issubdtype(P.dtype, np.integer) and P.size and P.min() >= 0
+            and P.max() < _dense_limit(P.shape[0])):
+        return np.arange(P.max() + 1), P
+    labels, code = np.unique(P, return_inverse=True)
+    return labels, code.reshape(P.shape)
+
+
+def _cell_keys(P):
+    """(labels, code, key): key = sample * len(labels) + code per entry."""
+    labels, code = label_codes(P)
+    n_samples = code.shape[1]
+    key = np.arange(n_samples, dtype=np.int64) * len(labels) + code
+    return labels, code, key
+
+
+def vote_counts(P):
+    """(sample, label, count) arrays over the (sample, label) pairs that
+    occur in P, sorted by sample and then label."""
+    labels, code, key = _cell_keys(P)
+    n_labels = len(labels)
+    if n_labels <= _dense_limit(code.shape[0]):
+        counts = np.bincount(key.ravel(), minlength=code.shape[1] * n_labels)
+        cells = np.flatnonzero(counts)
+        counts = counts[cells]
+    else:
+        cells, counts = np.unique(key.ravel(), return_counts=True)
+    return cells // n_labels, labels[cells % n_labels], counts
+
+
+def majority_vote(P):
+    """Plurality label of each column of P (smallest label wins a tie)."""
+    sample, label, count = vote_counts(P)
+    # stable: within a sample, equal counts keep ascending label order
+    order = np.lexsort((-count, sample))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sample[order][1:] != sample[order][:-1]
+    return label[order[first]]
+
+
+def pairwise_agreement(P):
+    """A[a, b] = fraction of samples on which agents a and b agree."""
+    labels, code, key = _cell_keys(P)
+    n_agents, n_samples = code.shape
+    used = np.unique(code)
+    if len(used) > _DENSE_LABELS:
+        # one-hot over the occurring (sample, label) cells: a single product
+        cells, col = np.unique(key.ravel(), return_inverse=True)
+        O = sparse.csr_matrix(
+            (np.ones(code.size), (np.repeat(np.arange(n_agents), n_samples),
+                                  col.ravel())),
+            shape=(n_agents, len(cells)))
+        return (O @ O.T).toarray() / n_samples
+    A = np.zeros((n_agents, n_agents))
+    for c in used:
+        for j in range(0, n_samples, _EXACT_F32):
+            M = (code[:, j:j + _EXACT_F32] == c).astype(np.float32)
+            A += M @ M.T
+    return A / n_samples
+
+
+def error_correlation(P, y):
+    """Pearson correlation of (agent wrong) indicators between agent pairs;
+    nan where an agent is always or never wrong."""
+    W = (np.asarray(P) != np.asarray(y)[None, :]).astype(np.float64)
+    C = W - W.mean(axis=1, keepdims=True)
+    G = C @ C.T
+    norm = np.sqrt(np.diag(G))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.outer(norm, norm) > 0, G / np.outer(norm, norm), np.nan)
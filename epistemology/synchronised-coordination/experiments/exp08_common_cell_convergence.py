@@ -29,6 +29,8 @@ from sklearn.datasets import load_digits
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 
+from consensus import error_correlation, majority_vote, pairwise_agreement
+
 RESULTS = Path(__file__).parent / "results"
 RESULTS.mkdir(exist_ok=True)
 RNG = np.random.default_rng(0)
@@ -64,27 +66,20 @@ names = list(quadrants.keys())
 err = {n: float(np.mean(preds_te[n] != yte)) for n in names}
 
 # ---- EXT08: convergence on the same cell despite disjoint representations ----
+P = np.vstack([preds_te[n] for n in names])       # (agents, test inputs)
+pairs = list(combinations(range(len(names)), 2))
 # pairwise agreement (fraction of test inputs mapped to the same label)
-agreement = {}
-for a, b in combinations(names, 2):
-    agreement[f"{a}|{b}"] = float(np.mean(preds_te[a] == preds_te[b]))
+A = pairwise_agreement(P)
+agreement = {f"{names[a]}|{names[b]}": float(A[a, b]) for a, b in pairs}
 mean_agreement = float(np.mean(list(agreement.values())))
 chance_agreement = 1.0 / 10  # 10 classes
 # fraction of inputs where ALL agents agree on one cell
-P = np.vstack([preds_te[n] for n in names])
 all_agree = float(np.mean(np.all(P == P[0], axis=0)))
 # of those, how often is the agreed cell the correct (attained) cell
 mask = np.all(P == P[0], axis=0)
 all_agree_correct = float(np.mean(P[0][mask] == yte[mask])) if mask.any() else float("nan")
 
 # ---- EXT09: catalytic composition (majority vote) error vs individuals ----
-def majority_vote(P):
-    out = np.empty(P.shape[1], dtype=int)
-    for j in range(P.shape[1]):
-        vals, cnts = np.unique(P[:, j], return_counts=True)
-        out[j] = vals[np.argmax(cnts)]
-    return out
-
 ens_pred = majority_vote(P)
 ens_err = float(np.mean(ens_pred != yte))
 best_individual = float(min(err.values()))
@@ -96,14 +91,8 @@ best_individual = float(min(err.values()))
 # measured pairwise error-correlation to show how far from independent it is.
 prod_err = float(np.prod([err[n] for n in names]))
 # error-correlation: corr of (agent wrong) indicators, averaged over pairs
-wrong = {n: (preds_te[n] != yte).astype(float) for n in names}
-corrs = []
-for a, b in combinations(names, 2):
-    ca = wrong[a] - wrong[a].mean()
-    cb = wrong[b] - wrong[b].mean()
-    denom = (np.sqrt((ca**2).sum()) * np.sqrt((cb**2).sum()))
-    if denom > 0:
-        corrs.append(float((ca*cb).sum()/denom))
+corr = error_correlation(P, yte)
+corrs = [corr[a, b] for a, b in pairs if corr[a, b] == corr[a, b]]
 mean_err_corr = float(np.mean(corrs))
 
 results = {